@@ -1,69 +1,184 @@
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from dataclasses import dataclass
-import json
-import urllib.request
-import urllib.error
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.retry import Retry
 
 from ..models import EmailMessage
 
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = 10  # seconds
+
+# One pooled session per API key, created lazily on first use, so consecutive
+# tasks in an automation run reuse the same TCP + TLS connection.
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
 @dataclass
 class ClickUpConfig:
     api_key: str
     list_id: str
+    task_url: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Computed once per config rather than per email.
+        self.task_url = f"https://api.clickup.com/api/v2/list/{self.list_id}/task"
 
 def get_clickup_config() -> Optional[ClickUpConfig]:
     api_key = os.environ.get("CLICKUP_API_KEY")
     list_id = os.environ.get("CLICKUP_LIST_ID")
-    
+
     if not api_key or not list_id:
         logger.warning("CLICKUP_API_KEY or CLICKUP_LIST_ID not set. ClickUp action specific configuration missing.")
         return None
     return ClickUpConfig(api_key=api_key, list_id=list_id)
 
+def _build_session(api_key: str) -> requests.Session:
+    session = requests.Session()
+    # Task creation is not idempotent, so POST is only resent when ClickUp
+    # cannot have processed it: the connection was never established, or the
+    # request was rejected with 429. Read timeouts and 5xx gateway errors may
+    # follow a created task and are never retried.
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=[429],
+        respect_retry_after_header=True,
+        allowed_methods=frozenset({"POST"}),
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry))
+    session.headers.update({"Authorization": api_key, "Content-Type": "application/json"})
+    return session
+
+def _get_session(config: ClickUpConfig) -> requests.Session:
+    with _sessions_lock:
+        session = _sessions.get(config.api_key)
+        if session is None:
+            session = _build_session(config.api_key)
+            _sessions[config.api_key] = session
+        return session
+
+def _reset_session(config: ClickUpConfig) -> requests.Session:
+    """
+    Drop the pooled session for this API key and create a fresh one.
+    """
+    with _sessions_lock:
+        stale = _sessions.pop(config.api_key, None)
+    if stale is not None:
+        stale.close()
+    return _get_session(config)
+
+def _is_connect_failure(exc: requests.ConnectionError) -> bool:
+    """
+    True if the request never reached ClickUp, so sending it again cannot
+    create a duplicate task.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = exc.args[0] if exc.args else None
+    # urllib3's MaxRetryError carries the underlying error as .reason.
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
 def create_task_from_email(msg: EmailMessage, config: ClickUpConfig) -> None:
     """
     Create a task in ClickUp for the given email.
     """
-    url = f"https://api.clickup.com/api/v2/list/{config.list_id}/task"
-    
     # Basic description from snippet or we could fetch body if needed.
     # For now, using snippet and metadata.
-    description = (
-        f"From: {msg.from_email}\n"
-        f"Date: {msg.date}\n"
-        f"Subject: {msg.subject}\n\n"
-        f"{msg.snippet}\n\n"
-        f"(Created via MailOps automation)"
-    )
-    
+    description = "".join((
+        "From: ", msg.from_email, "\n",
+        "Date: ", str(msg.date), "\n",
+        "Subject: ", msg.subject, "\n\n",
+        msg.snippet, "\n\n",
+        "(Created via MailOps automation)",
+    ))
+
     payload = {
         "name": msg.subject or "(No Subject)",
         "description": description,
         "status": "OPEN", # Default status
         # "priority": 3, # Normal
     }
-    
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, method="POST")
-    req.add_header("Authorization", config.api_key)
-    req.add_header("Content-Type", "application/json")
-    
+
+    session = _get_session(config)
     try:
-        with urllib.request.urlopen(req) as response:
-            if 200 <= response.status < 300:
-                res_body = response.read()
-                logger.info(f"Successfully created ClickUp task for message {msg.message_id}")
-                logger.debug(f"ClickUp response: {res_body}")
-            else:
-                logger.error(f"ClickUp API returned unexpected status: {response.status}")
-                
-    except urllib.error.HTTPError as e:
-        logger.error(f"ClickUp API failed: {e.code} - {e.read().decode('utf-8')}")
+        try:
+            response = session.post(config.task_url, json=payload, timeout=REQUEST_TIMEOUT)
+        except requests.ConnectionError as e:
+            # Reconnect once on a fresh session, but only if the request was
+            # never sent; a connection dropped mid-request may have created the task.
+            if not _is_connect_failure(e):
+                raise
+            logger.debug("ClickUp connection failed; reconnecting.")
+            session = _reset_session(config)
+            response = session.post(config.task_url, json=payload, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        logger.info(f"Successfully created ClickUp task for message {msg.message_id}")
+        logger.debug(f"ClickUp response: {response.content}")
+
+    except requests.HTTPError as e:
+        logger.error(f"ClickUp API failed: {e.response.status_code} - {e.response.text}")
         raise
     except Exception as e:
         logger.error(f"Failed to create ClickUp task: {e}")
         raise
+
+class _TokenBucket:
+    """
+    Simple thread-safe token bucket used to stay under ClickUp's rate limit
+    (100 requests per minute per token) when submitting tasks concurrently.
+    """
+
+    def __init__(self, capacity: int, per_seconds: float) -> None:
+        self._capacity = float(capacity)
+        self._rate = capacity / per_seconds
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+_rate_limiter = _TokenBucket(capacity=100, per_seconds=60.0)
+
+def create_tasks_from_emails(
+    msgs: list[EmailMessage], config: ClickUpConfig, max_workers: int = 8
+) -> list[bool]:
+    """
+    Create ClickUp tasks for several emails concurrently over the pooled session.
+    Returns one success flag per message, in order; failures are logged, not raised.
+    """
+    def _submit(msg: EmailMessage) -> bool:
+        _rate_limiter.acquire()
+        try:
+            create_task_from_email(msg, config)
+            return True
+        except Exception:
+            return False  # Error logged inside create_task_from_email
+
+    if not msgs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(msgs))) as executor:
+        return list(executor.map(_submit, msgs))
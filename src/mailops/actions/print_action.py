@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from logging import config
+import functools
+import io
 import os
 import subprocess
-import tempfile
+import textwrap
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -21,24 +24,36 @@ class PrintConfig:
 class PrintError(RuntimeError):
     pass
 
-def email_to_pdf(msg: EmailMessage, output_path: Path) -> None:
+def email_to_pdf(msg: EmailMessage, output_path: Optional[Path] = None) -> bytes:
     """
     Convert an email into a simple PDF suitable for printing.
     Keep it plain and robust; we can enhance formatting later.
+    The PDF is rendered in memory and returned; it is also written to
+    output_path when one is given.
     """ 
-    c = canvas.Canvas(str(output_path), pagesize=LETTER)
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=LETTER)
     width, height = LETTER
 
-    y = height - 50
+    top = height - 50
     line_height = 14
 
-    def draw_line(text: str) -> None:
-        nonlocal y
-        if y < 50:
+    def new_text():
+        # One text object per page: lines share a single BT/ET block and
+        # advance by the leading instead of repositioning each string.
+        t = c.beginText(50, top)
+        t.setLeading(line_height)
+        return t
+
+    text = new_text()
+
+    def draw_line(line: str) -> None:
+        nonlocal text
+        if text.getY() < 50:
+            c.drawText(text)
             c.showPage()
-            y = height - 50
-        c.drawString(50, y, text[:120])
-        y -= line_height
+            text = new_text()
+        text.textLine(line[:120])
 
     draw_line(f"From: {msg.from_email}")
     draw_line(f"Subject: {msg.subject}")
@@ -47,43 +62,93 @@ def email_to_pdf(msg: EmailMessage, output_path: Path) -> None:
 
     body = (msg.content.text or "").strip() or (msg.snippet or "")
     for raw_line in body.splitlines():
-        #naive wrap: split long lines
-        line = raw_line.strip()
-        while len(line) > 120:
-            draw_line(line[:120])
-            line = line[120:]
-        draw_line(line)
-    
+        # wrap long lines; keep blank lines as spacing
+        for line in textwrap.wrap(raw_line.strip(), width=120) or [""]:
+            draw_line(line)
+
+    c.drawText(text)
     c.save()
 
-def print_pdf(printer_name: str, pdf_path: Path, job_title: Optional[str] = None) -> None:
-    if not pdf_path.exists():
-        raise PrintError(f"PDF file does not exist: {pdf_path}")
+    pdf_bytes = buf.getvalue()
+    if output_path is not None:
+        output_path.write_bytes(pdf_bytes)
+    return pdf_bytes
+
+# pycups connections are not thread-safe and each job is a stateful
+# createJob/startDocument/writeRequestData/finishDocument sequence, so
+# concurrent print_pdf calls take turns on the shared connection.
+_cups_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _cups_connection():
+    """
+    Shared pycups connection, or None when pycups is not installed or CUPS
+    is unreachable (callers then fall back to the `lp` command).
+    """
+    try:
+        import cups
+        return cups.Connection()
+    except Exception:
+        return None
+
+def _reset_cups_connection() -> None:
+    """
+    Forget the shared connection (e.g. after CUPS restarted); the next job
+    reconnects, or falls back to `lp` if CUPS is still unreachable.
+    """
+    _cups_connection.cache_clear()
+
+def print_pdf(printer_name: str, pdf_bytes: bytes, job_title: Optional[str] = None) -> None:
+    """
+    Send an in-memory PDF to the printer without touching the filesystem.
+    """
+    with _cups_lock:
+        conn = _cups_connection()
+        if conn is not None:
+            # Stream the document over the persistent IPP connection; no fork/exec per job.
+            title = job_title or ""
+            try:
+                job_id = conn.createJob(printer_name, title, {})
+                conn.startDocument(printer_name, job_id, title, "application/pdf", 1)
+                conn.writeRequestData(pdf_bytes, len(pdf_bytes))
+                conn.finishDocument(printer_name)
+            except Exception as e:
+                _reset_cups_connection()
+                raise PrintError(f"Printing failed: {e}") from e
+            return
     
+    # lp reads the document from stdin when no file is given.
     cmd = ["lp", "-d", printer_name]
     if job_title:
         cmd += ["-t", job_title]
-    cmd.append(str(pdf_path))
 
     try: 
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        subprocess.run(cmd, input=pdf_bytes, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except subprocess.CalledProcessError as e:
-        raise PrintError(f"Printing failed: {e.stderr.strip()}") from e
+        stderr = (e.stderr or b"").decode("utf-8", errors="replace")
+        raise PrintError(f"Printing failed: {stderr.strip()}") from e
     
 
 def print_email(msg: EmailMessage, config: PrintConfig) -> None:
     job_title = f"{config.title_prefix}: {msg.subject}".strip()[:120]
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pdf_path = Path(tmpdir) / "email_print.pdf"
-        email_to_pdf(msg, pdf_path)
-        print_pdf(config.printer_name, pdf_path, job_title=job_title)
+    print_pdf(config.printer_name, email_to_pdf(msg), job_title=job_title)
 
 def get_available_printers() -> list[str]:
     """
     List available printers using lpstat.
     Returns a list of printer names.
+    The result is cached; call invalidate_printer_cache() to refresh it.
+    """
+    return list(_cached_printers())
+
+def invalidate_printer_cache() -> None:
     """
+    Drop the cached printer list so the next lookup re-runs lpstat.
+    """
+    _cached_printers.cache_clear()
+
+@functools.lru_cache(maxsize=1)
+def _cached_printers() -> tuple[str, ...]:
     try:
         # lpstat -a lists accepting destinations
         # Format: "Printer_Name accepting requests since ..."
@@ -99,10 +164,10 @@ def get_available_printers() -> list[str]:
             parts = line.split()
             if parts:
                 printers.append(parts[0])
-        return sorted(printers)
+        return tuple(sorted(printers))
     except FileNotFoundError:
         # lpstat not installed
-        return []
+        return ()
     except subprocess.CalledProcessError:
         # Error running command
-        return []
\ No newline at end of file
+        return ()
\ No newline at end of file
@@ -1,11 +1,21 @@
+from __future__ import annotations
+
+import argparse
+import re
 import sys
 from dataclasses import dataclass, replace
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from .gmail_client import GmailMessageSummary
-from .manager import Manager, SearchResult
 from .search import SearchFilters
 
+if TYPE_CHECKING:
+    from .gmail_client import GmailMessageSummary
+    from .manager import SearchResult
+
+# Manager (and with it googleapiclient and the auth stack) is imported inside
+# the commands that talk to Gmail, so `mailops` with no/unknown arguments and
+# help output stay fast.
+
 
 @dataclass
 class _PagerState:
@@ -18,31 +28,36 @@ def _print_results(items: list[GmailMessageSummary]) -> None:
         print("\nNo results.\n")
         return
 
-    print("\nResults:\n")
+    # Build the whole listing and write it once.
+    lines = ["\nResults:\n\n"]
     for i, m in enumerate(items, start=1):
         from_part = m.from_email or "(unknown sender)"
         subj = (m.subject or "").strip() or "(no subject)"
-        print(f"{i:>2}. {subj}  |  {from_part}")
-    print("")
+        lines.append(f"{i:>2}. {subj}  |  {from_part}\n")
+    lines.append("\n")
+    sys.stdout.write("".join(lines))
+
+
+_HELP_TEXT = (
+    "\nCommands:\n"
+    "  /s <text>          set full-text search (subject/from/body)\n"
+    "  /from <addr|dom>   filter by sender email or domain\n"
+    "  /days <n>          restrict to last n days\n"
+    "  /unread on|off     unread only (default on)\n"
+    "  /inbox on|off      inbox only (default on)\n"
+    "  /show              re-run search and show results\n"
+    "  /next              next page\n"
+    "  /prev              previous page (limited; see note)\n"
+    "  <nums>             select messages by number, e.g. 1,3,5\n"
+    "  /q                 quit\n"
+    "\nNotes:\n"
+    "  Gmail pagination uses page tokens. We support /next.\n"
+    "  /prev is best-effort by re-running from the start (v1).\n"
+)
 
 
 def _help() -> None:
-    print(
-        "\nCommands:\n"
-        "  /s <text>          set full-text search (subject/from/body)\n"
-        "  /from <addr|dom>   filter by sender email or domain\n"
-        "  /days <n>          restrict to last n days\n"
-        "  /unread on|off     unread only (default on)\n"
-        "  /inbox on|off      inbox only (default on)\n"
-        "  /show              re-run search and show results\n"
-        "  /next              next page\n"
-        "  /prev              previous page (limited; see note)\n"
-        "  <nums>             select messages by number, e.g. 1,3,5\n"
-        "  /q                 quit\n"
-        "\nNotes:\n"
-        "  Gmail pagination uses page tokens. We support /next.\n"
-        "  /prev is best-effort by re-running from the start (v1).\n"
-    )
+    print(_HELP_TEXT)
 
 
 def _parse_int(s: str) -> Optional[int]:
@@ -52,26 +67,19 @@ def _parse_int(s: str) -> Optional[int]:
         return None
 
 
+# One comma-separated token that is a (optionally "+"-signed) integer.
+_SELECTION_TOKEN = re.compile(r"(?:^|,)\s*\+?(\d+)\s*(?=,|$)")
+
+
 def _parse_selection(s: str, max_n: int) -> list[int]:
-    # "1,3,5" -> [1,3,5] (1-based)
-    out: list[int] = []
-    for part in s.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        n = _parse_int(part)
-        if n is None:
-            continue
-        if 1 <= n <= max_n:
-            out.append(n)
-    # de-dupe while preserving order
-    seen = set()
-    deduped: list[int] = []
-    for n in out:
-        if n not in seen:
-            seen.add(n)
-            deduped.append(n)
-    return deduped
+    # "1,3,5" -> [1,3,5] (1-based); one regex scan, de-duped in order
+    valid = range(1, max_n + 1)
+    selected: dict[int, None] = {}
+    for m in _SELECTION_TOKEN.finditer(s):
+        n = int(m.group(1))
+        if n in valid:
+            selected.setdefault(n, None)
+    return list(selected)
 
 
 def configure() -> int:
@@ -81,6 +89,7 @@ def configure() -> int:
       - Let user select example newsletter emails
       - Print selected message IDs (next step will infer rules)
     """
+    from .manager import Manager
     mgr = Manager()
 
     filters = SearchFilters(text=None, from_addr=None, newer_than_days=7, unread_only=True, inbox_only=True)
@@ -205,13 +214,15 @@ def configure() -> int:
         return 0
 
 
+_RUN_PARSER = argparse.ArgumentParser(prog="mailops run")
+_RUN_PARSER.add_argument("--dry-run", action="store_true", help="Only show what would happen")
+_RUN_PARSER.add_argument("--yes", "-y", action="store_true", help="Skip confirmation")
+
+
 def run_automation(argv: list[str]) -> int:
-    import argparse
-    parser = argparse.ArgumentParser(prog="mailops run")
-    parser.add_argument("--dry-run", action="store_true", help="Only show what would happen")
-    parser.add_argument("--yes", "-y", action="store_true", help="Skip confirmation")
-    args = parser.parse_args(argv)
+    args = _RUN_PARSER.parse_args(argv)
     
+    from .manager import Manager
     mgr = Manager()
     print("Checking for automation matches...")
     plan = mgr.get_automation_plan()
@@ -220,15 +231,18 @@ def run_automation(argv: list[str]) -> int:
         print("No matches found.")
         return 0
 
-    print(f"\nPlanned Actions ({len(plan)}):")
-    print(f"{'ACTION':<10} | {'RULE':<15} | {'SUBJECT':<40} | {'FROM'}")
-    print("-" * 80)
+    lines = [
+        f"\nPlanned Actions ({len(plan)}):\n",
+        f"{'ACTION':<10} | {'RULE':<15} | {'SUBJECT':<40} | {'FROM'}\n",
+        "-" * 80 + "\n",
+    ]
     for item, rule in plan:
         subj = (item.subject or "")[:38]
         # Clean newlines from subject for display
         subj = subj.replace("\n", " ").replace("\r", "")
-        print(f"{rule.action:<10} | {rule.name[:15]:<15} | {subj:<40} | {item.from_email}")
-    print("-" * 80)
+        lines.append(f"{rule.action:<10} | {rule.name[:15]:<15} | {subj:<40} | {item.from_email}\n")
+    lines.append("-" * 80 + "\n")
+    sys.stdout.write("".join(lines))
 
     if args.dry_run:
         print("\nDry run complete. No actions taken.")
@@ -251,20 +265,20 @@ def run_automation(argv: list[str]) -> int:
     return 0
 
 
+# helper for one-off search from CLI args
+# mailops search --from "foo" --days 3
+_SEARCH_PARSER = argparse.ArgumentParser(prog="mailops search")
+_SEARCH_PARSER.add_argument("--query", "-q", help="Full text query")
+_SEARCH_PARSER.add_argument("--sender", "--from", help="Sender address or domain")
+_SEARCH_PARSER.add_argument("--days", type=int, help="Newer than N days")
+_SEARCH_PARSER.add_argument("--unread", action="store_true", help="Unread only (default false if omitted)")
+_SEARCH_PARSER.add_argument("--archive", action="store_true", help="Archive results")
+_SEARCH_PARSER.add_argument("--delete", action="store_true", help="Delete results (trash)")
+_SEARCH_PARSER.add_argument("--dry-run", action="store_true", help="Dry run actions")
+
+
 def search_cli(argv: list[str]) -> int:
-    # helper for one-off search from CLI args
-    # mailops search --from "foo" --days 3
-    import argparse
-    parser = argparse.ArgumentParser(prog="mailops search")
-    parser.add_argument("--query", "-q", help="Full text query")
-    parser.add_argument("--sender", "--from", help="Sender address or domain")
-    parser.add_argument("--days", type=int, help="Newer than N days")
-    parser.add_argument("--unread", action="store_true", help="Unread only (default false if omitted)")
-    parser.add_argument("--archive", action="store_true", help="Archive results")
-    parser.add_argument("--delete", action="store_true", help="Delete results (trash)")
-    parser.add_argument("--dry-run", action="store_true", help="Dry run actions")
-
-    args = parser.parse_args(argv)
+    args = _SEARCH_PARSER.parse_args(argv)
 
     filters = SearchFilters(
         text=args.query,
@@ -274,6 +288,7 @@ def search_cli(argv: list[str]) -> int:
         inbox_only=True
     )
 
+    from .manager import Manager
     mgr = Manager()
     res = mgr.search(filters, max_results=50)
     
@@ -292,16 +307,19 @@ def search_cli(argv: list[str]) -> int:
     return 0
 
 
+_USAGE = (
+    "Usage:\n"
+    "  mailops configure\n"
+    "  mailops run [--dry-run]\n"
+    "  mailops search [options]\n"
+    "  mailops ui [port]\n"
+)
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     argv = argv or sys.argv[1:]
     if not argv or argv[0] in ("-h", "--help", "help"):
-        print(
-            "Usage:\n"
-            "  mailops configure\n"
-            "  mailops run [--dry-run]\n"
-            "  mailops search [options]\n"
-            "  mailops ui [port]\n"
-        )
+        print(_USAGE)
         return 0
 
     cmd = argv[0]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal, Optional
@@ -23,7 +25,7 @@ def _default_config_path() -> Path:
     return Path.home() / ".config" / "mailops" / "config.json"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MatchCriteria:
     """
     Match criteria is intentionally flexible and JSON-serializable.
@@ -63,7 +65,7 @@ class MatchCriteria:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PrintRule:
     name: str
     action: ActionType
@@ -114,24 +116,66 @@ class AppConfig:
 
 
 def load_config(path: Optional[Path] = None) -> AppConfig:
+    """
+    Load the config file. Parsed configs are cached by path and modification
+    time, so repeated loads of an unchanged file cost a single stat().
+    """
     p = path or _default_config_path()
-    if not p.exists():
+    try:
+        mtime_ns = p.stat().st_mtime_ns
+    except FileNotFoundError:
         # Return a safe default config if none exists yet.
         return AppConfig(printer_name="HP577dw", print_rules=())
 
-    data = json.loads(p.read_text(encoding="utf-8"))
+    return _load_config_cached(str(p), mtime_ns)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(path: str, mtime_ns: int) -> AppConfig:
+    # mtime_ns is part of the cache key only; a changed file gets a new entry.
+    # json.loads accepts UTF-8 bytes directly; no separate text decode step.
+    data = json.loads(Path(path).read_bytes())
     if not isinstance(data, dict):
         raise ValueError("Config file root must be a JSON object.")
     return AppConfig.from_dict(data)
 
 
+def reload_config(path: Optional[Path] = None) -> AppConfig:
+    """
+    Drop any cached configs and load from disk again.
+    """
+    _load_config_cached.cache_clear()
+    return load_config(path)
+
+
 def save_config(cfg: AppConfig, path: Optional[Path] = None) -> Path:
     p = path or _default_config_path()
     p.parent.mkdir(parents=True, exist_ok=True)
 
-    tmp = p.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(cfg.to_dict(), indent=2, sort_keys=True) + "\n", encoding="utf-8")
-    tmp.replace(p)
+    data = (json.dumps(cfg.to_dict(), indent=2, sort_keys=True) + "\n").encode("utf-8")
+    # Write and fsync a temp file before the atomic rename so a crash can
+    # never leave a truncated config in place. The name is unique per call,
+    # so concurrent saves (the dashboard is threaded) never share a temp file.
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=p.name + ".", suffix=".tmp")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        # mkstemp creates the file 0600; keep the usual config permissions.
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Don't rely on mtime granularity to notice our own write.
+    _load_config_cached.cache_clear()
     return p
 
 
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the schema changes; older caches are dropped and rebuilt.
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+DROP TABLE IF EXISTS msg;
+DROP TABLE IF EXISTS labels;
+CREATE TABLE msg (
+    msg_id TEXT PRIMARY KEY,
+    headers_json BLOB NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+CREATE INDEX msg_fetched_at ON msg (fetched_at);
+CREATE TABLE labels (
+    msg_id TEXT PRIMARY KEY,
+    label_ids TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+"""
+
+# Labels change outside mailops (read in another client, Gmail filters), so a
+# cached entry is only served while its labels are this fresh.
+LABEL_TTL = 10 * 60  # seconds
+# Rows not refreshed for this long are evicted when the cache is opened.
+MAX_AGE = 30 * 24 * 60 * 60  # seconds
+
+
+def default_cache_path() -> Path:
+    base = os.environ.get("MAILOPS_CACHE_DIR")
+    if base:
+        return Path(base).expanduser() / "headers.sqlite"
+    return Path("~/.cache/mailops").expanduser() / "headers.sqlite"
+
+
+class HeaderCache:
+    """
+    On-disk cache of messages.get(format="metadata") responses keyed by id.
+    Headers never change after delivery, but labels do, so an entry is only
+    returned while its labels are younger than label_ttl; older entries count
+    as misses and are refreshed by the next fetch. Labels are also updated
+    whenever we modify them ourselves.
+    """
+
+    def __init__(self, path: Path, label_ttl: float = LABEL_TTL, max_age: float = MAX_AGE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._label_ttl = label_ttl
+        # Shared by the client's worker threads; the lock serializes access.
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self.evict(max_age)
+
+    def evict(self, max_age: float) -> None:
+        """
+        Delete messages fetched more than max_age seconds ago.
+        """
+        cutoff = int(time.time() - max_age)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM msg WHERE fetched_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM labels WHERE msg_id NOT IN (SELECT msg_id FROM msg)")
+
+    @staticmethod
+    def open_default() -> Optional["HeaderCache"]:
+        """
+        Open the cache at default_cache_path(), or return None if it cannot be
+        opened (the client then always goes to Gmail).
+        """
+        try:
+            return HeaderCache(default_cache_path())
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Header cache unavailable ({e}); continuing without it.")
+            return None
+
+    def get_many(self, message_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """
+        Return cached metadata responses for the given ids. Misses, and
+        entries whose labels are older than the label TTL, are omitted.
+        """
+        return self._read(message_ids, min_labels_at=int(time.time() - self._label_ttl))
+
+    def _read(self, message_ids: Iterable[str], min_labels_at: int) -> dict[str, dict[str, Any]]:
+        ids = list(message_ids)
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit.
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT m.msg_id, m.headers_json, l.label_ids FROM msg m "
+                    f"JOIN labels l ON l.msg_id = m.msg_id "
+                    f"WHERE m.msg_id IN ({marks}) AND l.fetched_at >= ?",
+                    (*chunk, min_labels_at),
+                ).fetchall()
+                for msg_id, headers_json, label_ids in rows:
+                    msg = json.loads(headers_json)
+                    msg["labelIds"] = json.loads(label_ids)
+                    found[msg_id] = msg
+        return found
+
+    def get(self, message_id: str) -> Optional[dict[str, Any]]:
+        return self.get_many((message_id,)).get(message_id)
+
+    def put_many(self, msgs: Iterable[dict[str, Any]]) -> None:
+        now = int(time.time())
+        msg_rows = []
+        label_rows = []
+        for msg in msgs:
+            labels = msg.get("labelIds") or []
+            headers = {k: v for k, v in msg.items() if k != "labelIds"}
+            msg_rows.append((msg["id"], json.dumps(headers).encode("utf-8"), now))
+            label_rows.append((msg["id"], json.dumps(labels), now))
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO msg VALUES (?, ?, ?)", msg_rows)
+            self._conn.executemany("INSERT OR REPLACE INTO labels VALUES (?, ?, ?)", label_rows)
+
+    def update_labels(
+        self,
+        message_ids: Iterable[str],
+        add: Optional[list[str]] = None,
+        remove: Optional[list[str]] = None,
+    ) -> None:
+        """
+        Apply a label change to cached messages; ids not in the cache are ignored.
+        The label timestamp is kept: other changes may still be unseen.
+        """
+        add = add or []
+        drop = set(remove or [])
+        rows = []
+        for msg_id, msg in self._read(message_ids, min_labels_at=0).items():
+            labels = [l for l in msg["labelIds"] if l not in drop]
+            labels += [l for l in add if l not in labels]
+            rows.append((json.dumps(labels), msg_id))
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE labels SET label_ids = ? WHERE msg_id = ?", rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,28 +1,71 @@
 from __future__ import annotations
 
 import base64
+import functools
+import logging
 import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from email.utils import parseaddr, parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 
+from .gmail_cache import HeaderCache
 
-# Minimal scopes for: reading messages and modifying labels (mark read / add label).
-# We are NOT using full mail access.
-SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional: pip install mailops[fastjson]
+    orjson = None
 
+# Minimal scopes for: reading messages and modifying labels (mark read / add label).
+# We are NOT using full mail access.
+SCOPES = ("https://www.googleapis.com/auth/gmail.modify",)
+
+# Gmail accepts up to 100 calls per batch but recommends staying at or below
+# 50 to avoid per-user rate limiting.
+_BATCH_SIZE = 50
+# Upper bound on ids per users.messages.batchModify call.
+_BATCH_MODIFY_SIZE = 1000
+# Metadata batches shrink when Gmail throttles and grow back by this step.
+_BATCH_SIZE_STEP = 5
+# Retries for 429/5xx responses; single requests use googleapiclient's own
+# exponential backoff, throttled batch calls are retried by us.
+_NUM_RETRIES = 5
+# Concurrent single gets when a batch request fails (e.g. /batch is blocked).
+_FALLBACK_WORKERS = 8
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    if not isinstance(exc, HttpError):
+        return False
+    if exc.resp.status == 429:
+        return True
+    return exc.resp.status == 403 and "ratelimitexceeded" in str(exc).lower()
+
+
+@functools.cache
 def _default_secrets_dir() -> Path:
     # Keep secrets out of git. You already ignore secrets/ in .gitignore.
     return Path(os.environ.get("MAILOPS_SECRETS_DIR", "secrets")).expanduser()
 
 
+@functools.cache
 def _client_secret_path() -> Path:
     p = os.environ.get("MAILOPS_GMAIL_CLIENT_SECRET")
     if p:
@@ -30,6 +73,7 @@ def _client_secret_path() -> Path:
     return _default_secrets_dir() / "gmail_oauth_client.json"
 
 
+@functools.cache
 def _token_path() -> Path:
     p = os.environ.get("MAILOPS_GMAIL_TOKEN_PATH")
     if p:
@@ -37,7 +81,7 @@ def _token_path() -> Path:
     return _default_secrets_dir() / "gmail_token.json"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GmailMessageSummary:
     message_id: str
     thread_id: Optional[str]
@@ -49,23 +93,48 @@ class GmailMessageSummary:
 
 
 def _parse_headers(payload: dict[str, Any]) -> dict[str, str]:
-    headers = payload.get("headers", []) or []
-    out: dict[str, str] = {}
-    for h in headers:
-        name = (h.get("name") or "").strip()
-        value = (h.get("value") or "").strip()
-        if name:
-            out[name.lower()] = value
-    return out
+    # Gmail always sends name/value pairs; later duplicates win, as before.
+    return {
+        h["name"].lower(): (h.get("value") or "").strip()
+        for h in payload.get("headers") or ()
+        if h.get("name")
+    }
+
+
+# Fast path for the common "Tue, 7 Jan 2026 09:21:00 -0500" shape; anything
+# else (obsolete zones, two-digit years, missing seconds) goes to email.utils.
+_DATE_FAST = re.compile(
+    r"(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+"
+    r"(\d\d):(\d\d):(\d\d)\s+([+-])(\d\d)(\d\d)\b"
+)
+_MONTHS = {
+    m: i
+    for i, m in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+    )
+}
+_TZ_CACHE: dict[str, timezone] = {}
 
 
 def _parse_rfc2822_date(date_str: str) -> Optional[datetime]:
     # Gmail "Date" header is RFC 2822-ish. We keep parsing simple and safe.
     # For our use-case, date is helpful but not critical.
-    try:
-        # Example: "Tue, 7 Jan 2026 09:21:00 -0500"
-        from email.utils import parsedate_to_datetime
+    m = _DATE_FAST.match(date_str)
+    if m:
+        day, mon, year, hh, mm, ss, sign, tzh, tzm = m.groups()
+        month = _MONTHS.get(mon.lower())
+        if month:
+            offset = sign + tzh + tzm
+            try:
+                tz = _TZ_CACHE.get(offset)
+                if tz is None:
+                    minutes = int(tzh) * 60 + int(tzm)
+                    tz = _TZ_CACHE[offset] = timezone(timedelta(minutes=-minutes if sign == "-" else minutes))
+                return datetime(int(year), month, int(day), int(hh), int(mm), int(ss), tzinfo=tz)
+            except ValueError:
+                pass  # e.g. second=60 or offset +9999; let email.utils decide
 
+    try:
         dt = parsedate_to_datetime(date_str)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
@@ -74,19 +143,78 @@ def _parse_rfc2822_date(date_str: str) -> Optional[datetime]:
         return None
 
 
+@functools.lru_cache(maxsize=1024)
 def _extract_email_address(from_header: str) -> str:
     # "Name <addr@domain>" -> addr@domain
-    from email.utils import parseaddr
-
+    # Cached: newsletter senders repeat the same From header run after run.
     _, addr = parseaddr(from_header or "")
     return addr or (from_header or "").strip()
 
 
+def _build_summary(msg: dict[str, Any]) -> GmailMessageSummary:
+    """
+    Build a summary from a messages.get(format="metadata") response.
+    """
+    payload = msg.get("payload", {}) or {}
+    headers = _parse_headers(payload)
+
+    return GmailMessageSummary(
+        message_id=msg["id"],
+        thread_id=msg.get("threadId"),
+        from_email=_extract_email_address(headers.get("from", "")),
+        subject=headers.get("subject", "") or "",
+        date=_parse_rfc2822_date(headers.get("date", "") or ""),
+        snippet=msg.get("snippet", "") or "",
+        label_ids=tuple(msg.get("labelIds", []) or []),
+    )
+
+
+class _OrjsonModel(JsonModel):
+    """
+    JsonModel that parses response bodies with orjson. Request bodies are
+    small and still go through the stdlib encoder.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+def _build_service(creds: Credentials):
+    # Use the discovery document bundled with google-api-python-client instead
+    # of fetching it over the network on every start; with a static document
+    # there is nothing for the (file-based) discovery cache to do.
+    return build(
+        "gmail",
+        "v1",
+        credentials=creds,
+        static_discovery=True,
+        cache_discovery=False,
+        model=_OrjsonModel() if orjson is not None else None,
+    )
+
+
 class GmailClient:
-    def __init__(self, creds: Credentials) -> None:
+    def __init__(self, creds: Credentials, header_cache: Optional[HeaderCache] = None) -> None:
         self._creds = creds
-        # cache service client
-        self._svc = build("gmail", "v1", credentials=self._creds)
+        self._header_cache = header_cache
+        # The discovery service (and its httplib2 transport) is not thread-safe,
+        # so each thread gets its own cached service client.
+        self._batch_size = _BATCH_SIZE
+        self._local = threading.local()
+        self._local.svc = _build_service(self._creds)
+
+    @property
+    def _svc(self):
+        svc = getattr(self._local, "svc", None)
+        if svc is None:
+            svc = self._local.svc = _build_service(self._creds)
+        return svc
 
     @staticmethod
     def from_oauth() -> "GmailClient":
@@ -124,7 +252,17 @@ class GmailClient:
                     creds = flow.run_console()
             token_path.write_text(creds.to_json(), encoding="utf-8")
 
-        return GmailClient(creds)
+        return GmailClient(creds, header_cache=HeaderCache.open_default())
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def from_oauth_cached() -> "GmailClient":
+        """
+        Process-wide client from from_oauth(). Reusing it keeps the parsed
+        credentials (refreshed in place as needed) and the per-thread service
+        connections across Manager instances.
+        """
+        return GmailClient.from_oauth()
 
     def search_messages(
         self,
@@ -137,29 +275,50 @@ class GmailClient:
         Search messages using Gmail query syntax. Returns message summaries and next_page_token.
         This is the core backend primitive for CLI search/filter and future frontend.
         """
+        ids, next_token = self._list_ids(query, max_results, page_token, user_id)
+        return self.batch_get_message_summaries(ids, user_id=user_id), next_token
+
+    def iter_messages(
+        self,
+        query: str,
+        page_size: int = 100,
+        user_id: str = "me",
+    ) -> Iterator[GmailMessageSummary]:
+        """
+        Yield summaries for every message matching the query, across all pages.
+        The next page (list call plus metadata batch) is fetched in a background
+        thread while the caller consumes the current one.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self._fetch_page, query, page_size, None, user_id)
+            while pending is not None:
+                items, next_token = pending.result()
+                pending = (
+                    executor.submit(self._fetch_page, query, page_size, next_token, user_id)
+                    if next_token else None
+                )
+                yield from items
+
+    def _fetch_page(
+        self, query: str, page_size: int, page_token: Optional[str], user_id: str
+    ) -> tuple[list[GmailMessageSummary], Optional[str]]:
+        ids, next_token = self._list_ids(query, page_size, page_token, user_id)
+        return self.batch_get_message_summaries(ids, user_id=user_id), next_token
+
+    def _list_ids(
+        self, query: str, max_results: int, page_token: Optional[str], user_id: str
+    ) -> tuple[list[str], Optional[str]]:
         req = (
             self._svc.users()
             .messages()
             .list(userId=user_id, q=query, maxResults=max_results, pageToken=page_token)
         )
-        resp = req.execute()
+        resp = req.execute(num_retries=_NUM_RETRIES)
         msgs = resp.get("messages", []) or []
-        next_token = resp.get("nextPageToken")
+        return [m["id"] for m in msgs if m.get("id")], resp.get("nextPageToken")
 
-        out: list[GmailMessageSummary] = []
-        for m in msgs:
-            mid = m.get("id")
-            if not mid:
-                continue
-            out.append(self.get_message_summary(mid, user_id=user_id))
-
-        return out, next_token
-
-    def get_message_summary(self, message_id: str, user_id: str = "me") -> GmailMessageSummary:
-        """
-        Fetch metadata for a single message (headers + snippet + labels), no body parts.
-        """
-        req = (
+    def _metadata_request(self, message_id: str, user_id: str):
+        return (
             self._svc.users()
             .messages()
             .get(
@@ -169,28 +328,106 @@ class GmailClient:
                 metadataHeaders=["From", "Subject", "Date"],
             )
         )
-        msg = req.execute()
 
-        payload = msg.get("payload", {}) or {}
-        headers = _parse_headers(payload)
+    def batch_get_message_summaries(
+        self, message_ids: list[str], user_id: str = "me"
+    ) -> list[GmailMessageSummary]:
+        """
+        Fetch summaries for several messages using batched HTTP requests.
+        Results keep the input order.
+        Calls rejected for rate limiting are retried in smaller batches after
+        an exponential backoff; the batch size grows back on clean rounds.
+        If a batch request itself fails, that chunk is fetched one message at a time.
+        Messages with a fresh entry in the header cache are not requested at all.
+        """
+        cached = self._header_cache.get_many(message_ids) if self._header_cache is not None else {}
+        results: dict[int, dict[str, Any]] = {
+            i: cached[mid] for i, mid in enumerate(message_ids) if mid in cached
+        }
+        pending = [i for i in range(len(message_ids)) if i not in results]
+        attempt = 0
+
+        while pending:
+            throttled: dict[int, Exception] = {}
+            failures: list[Exception] = []
+
+            def _on_response(request_id: str, response: dict[str, Any], exception: Optional[Exception]) -> None:
+                if exception is None:
+                    results[int(request_id)] = response
+                elif _is_rate_limited(exception):
+                    throttled[int(request_id)] = exception
+                else:
+                    failures.append(exception)
+
+            size = self._batch_size
+            for start in range(0, len(pending), size):
+                chunk = pending[start:start + size]
+                batch = self._svc.new_batch_http_request(callback=_on_response)
+                for i in chunk:
+                    batch.add(self._metadata_request(message_ids[i], user_id), request_id=str(i))
+                try:
+                    batch.execute()
+                except Exception as e:
+                    logger.warning(f"Batch metadata request failed ({e}); fetching {len(chunk)} messages individually.")
+                    failures.clear()
+                    missing = [i for i in chunk if i not in results]
+                    fetched = self._get_metadata_individually([message_ids[i] for i in missing], user_id)
+                    for i, msg in zip(missing, fetched):
+                        results[i] = msg
+                        throttled.pop(i, None)
+                if failures:
+                    raise failures[0]
+
+            if not throttled:
+                # Additive increase after a round with no throttling.
+                self._batch_size = min(_BATCH_SIZE, self._batch_size + _BATCH_SIZE_STEP)
+                break
+
+            attempt += 1
+            if attempt > _NUM_RETRIES:
+                raise next(iter(throttled.values()))
+            # Multiplicative decrease, then back off before retrying the rejected ids.
+            self._batch_size = max(1, self._batch_size // 2)
+            delay = min(60.0, 2 ** attempt + random.random())
+            logger.warning(
+                f"Gmail rate limit hit for {len(throttled)} messages; retrying in {delay:.1f}s "
+                f"with batches of {self._batch_size}."
+            )
+            time.sleep(delay)
+            pending = sorted(throttled)
 
-        from_email = _extract_email_address(headers.get("from", ""))
-        subject = headers.get("subject", "") or ""
-        date = _parse_rfc2822_date(headers.get("date", "") or "")
+        if self._header_cache is not None and len(cached) < len(message_ids):
+            self._header_cache.put_many(
+                results[i] for i, mid in enumerate(message_ids) if mid not in cached
+            )
+        return [_build_summary(results[i]) for i in range(len(message_ids))]
 
-        snippet = msg.get("snippet", "") or ""
-        label_ids = tuple(msg.get("labelIds", []) or [])
-        thread_id = msg.get("threadId")
+    def _get_metadata_individually(self, message_ids: list[str], user_id: str) -> list[dict[str, Any]]:
+        """
+        One metadata get per message, issued concurrently; results keep the input order.
+        """
+        def _get(message_id: str) -> dict[str, Any]:
+            # Runs on a pool thread, which gets its own service from _svc.
+            return self._metadata_request(message_id, user_id).execute(num_retries=_NUM_RETRIES)
 
-        return GmailMessageSummary(
-            message_id=message_id,
-            thread_id=thread_id,
-            from_email=from_email,
-            subject=subject,
-            date=date,
-            snippet=snippet,
-            label_ids=label_ids,
-        )
+        if len(message_ids) <= 1:
+            return [_get(mid) for mid in message_ids]
+        with ThreadPoolExecutor(max_workers=min(_FALLBACK_WORKERS, len(message_ids))) as executor:
+            return list(executor.map(_get, message_ids))
+
+    def get_message_summary(self, message_id: str, user_id: str = "me") -> GmailMessageSummary:
+        """
+        Fetch metadata for a single message (headers + snippet + labels), no body parts.
+        Served from the header cache while its cached labels are still fresh.
+        """
+        if self._header_cache is not None:
+            msg = self._header_cache.get(message_id)
+            if msg is not None:
+                return _build_summary(msg)
+        msg = self._metadata_request(message_id, user_id).execute(num_retries=_NUM_RETRIES)
+        if self._header_cache is not None:
+            self._header_cache.put_many((msg,))
+        return _build_summary(msg)
 
     def modify_labels(
         self,
@@ -201,7 +438,31 @@ class GmailClient:
     ) -> None:
         body = {"addLabelIds": add or [], "removeLabelIds": remove or []}
         req = self._svc.users().messages().modify(userId=user_id, id=message_id, body=body)
-        req.execute()
+        req.execute(num_retries=_NUM_RETRIES)
+        if self._header_cache is not None:
+            self._header_cache.update_labels((message_id,), add=add, remove=remove)
+
+    def batch_modify_labels(
+        self,
+        message_ids: list[str],
+        add: Optional[list[str]] = None,
+        remove: Optional[list[str]] = None,
+        user_id: str = "me",
+    ) -> None:
+        """
+        Apply the same label change to many messages, one batchModify call
+        per _BATCH_MODIFY_SIZE ids.
+        """
+        messages = self._svc.users().messages()
+        for start in range(0, len(message_ids), _BATCH_MODIFY_SIZE):
+            body = {
+                "ids": message_ids[start:start + _BATCH_MODIFY_SIZE],
+                "addLabelIds": add or [],
+                "removeLabelIds": remove or [],
+            }
+            messages.batchModify(userId=user_id, body=body).execute(num_retries=_NUM_RETRIES)
+            if self._header_cache is not None:
+                self._header_cache.update_labels(body["ids"], add=add, remove=remove)
 
     def mark_read(self, message_id: str, user_id: str = "me") -> None:
         self.modify_labels(message_id, remove=["UNREAD"], user_id=user_id)
@@ -220,7 +481,7 @@ class GmailClient:
             .messages()
             .get(userId=user_id, id=message_id, format="full")
         )
-        msg = req.execute()
+        msg = req.execute(num_retries=_NUM_RETRIES)
 
         payload = msg.get("payload", {}) or {}
         headers = _parse_headers(payload)
@@ -236,25 +497,26 @@ class GmailClient:
         text_parts: list[str] = []
         html_parts: list[str] = []
 
-        def _traverse(p: dict[str, Any]):
-            mime_type = p.get("mimeType", "")
-            body = p.get("body", {})
-            data = body.get("data")
-            if data:
-                try:
-                    decoded = base64.urlsafe_b64decode(data).decode("utf-8", errors="replace")
-                    if mime_type == "text/plain":
-                        text_parts.append(decoded)
-                    elif mime_type == "text/html":
-                        html_parts.append(decoded)
-                except Exception:
-                    pass  # skip undecodable parts
-
-            parts = p.get("parts", [])
-            for sub in parts:
-                _traverse(sub)
-
-        _traverse(payload)
+        # Iterative pre-order walk over the MIME tree (same part order as a
+        # recursive walk, without the recursion depth limit).
+        queue = deque((payload,))
+        while queue:
+            part = queue.popleft()
+            # Only text bodies are kept, so other parts (inline images,
+            # attachments with embedded data) are never base64-decoded.
+            mime_type = part.get("mimeType", "")
+            target = text_parts if mime_type == "text/plain" else html_parts if mime_type == "text/html" else None
+            if target is not None:
+                data = (part.get("body") or {}).get("data")
+                if data:
+                    try:
+                        target.append(base64.urlsafe_b64decode(data).decode("utf-8", errors="replace"))
+                    except Exception:
+                        pass  # skip undecodable parts
+
+            sub_parts = part.get("parts")
+            if sub_parts:
+                queue.extendleft(reversed(sub_parts))
 
         content = EmailContent(
             text="\n".join(text_parts),
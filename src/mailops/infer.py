@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from email.utils import parseaddr
 from typing import Any, Optional
 
 from .config import MatchCriteria, PrintRule
@@ -70,8 +71,6 @@ def infer_print_rule(rule_name: str, example_headers: list[dict[str, str]]) -> I
     # We do not parse fully here; we keep it simple and match by from_exact later if needed.
     if from_vals:
         # Attempt domain extraction from something like "Name <addr@domain>"
-        from email.utils import parseaddr
-
         domains: list[str] = []
         addrs: list[str] = []
         for fv in from_vals:
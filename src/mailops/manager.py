@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Optional, Sequence
 
 from .config import AppConfig, load_config
 from .gmail_client import GmailClient, GmailMessageSummary
-from .rules import RulesEngine, rule_from_config
-from .search import SearchFilters, build_gmail_query, search_messages
+from .models import EmailContent, EmailMessage
+from .rules import Rule, RulesEngine, rule_from_config
+from .search import SearchFilters, build_gmail_query, iter_messages, search_messages
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +21,42 @@ class SearchResult:
     next_page_token: Optional[str]
 
 
+def _partial_message(summary: GmailMessageSummary) -> EmailMessage:
+    """
+    Build a body-less EmailMessage from a message summary.
+    """
+    return EmailMessage(
+        message_id=summary.message_id,
+        thread_id=summary.thread_id,
+        from_email=summary.from_email,
+        to_emails=(),
+        subject=summary.subject,
+        date=summary.date,
+        snippet=summary.snippet,
+        labels=frozenset(summary.label_ids),
+        content=EmailContent(),
+        has_attachments=False,
+        attachment_count=0
+    )
+
+
+# Attributes a GmailMessageSummary shares with EmailMessage. Rules that read
+# only these can be matched against summaries directly.
+_SUMMARY_FIELDS = frozenset(
+    f.name for f in dataclasses.fields(GmailMessageSummary)
+) & frozenset(f.name for f in dataclasses.fields(EmailMessage))
+
+
+def _matchable(item: GmailMessageSummary, fields: Optional[frozenset[str]]):
+    """
+    The summary itself when it carries every field the rules read, else a
+    partial EmailMessage built from it.
+    """
+    if fields is not None and _SUMMARY_FIELDS.issuperset(fields):
+        return item
+    return _partial_message(item)
+
+
 class Manager:
     """
     The Manager class orchestrates the application logic.
@@ -30,7 +69,7 @@ class Manager:
         client: Optional[GmailClient] = None,
         config: Optional[AppConfig] = None,
     ) -> None:
-        self._client = client or GmailClient.from_oauth()
+        self._client = client or GmailClient.from_oauth_cached()
         self._config = config or load_config()
         self._rules_engine = RulesEngine(
             rule_from_config(r) for r in self._config.print_rules
@@ -113,20 +152,7 @@ class Manager:
 
             summary = self._client.get_message_summary(message_id)
             # Create partial EmailMessage for the action
-            from .models import EmailMessage, EmailContent
-            msg = EmailMessage(
-                message_id=summary.message_id,
-                thread_id=summary.thread_id,
-                from_email=summary.from_email,
-                to_emails=(),
-                subject=summary.subject,
-                date=summary.date,
-                snippet=summary.snippet,
-                labels=frozenset(summary.label_ids),
-                content=EmailContent(),
-                has_attachments=False,
-                attachment_count=0
-            )
+            msg = _partial_message(summary)
             
             try:
                 create_task_from_email(msg, cfg)
@@ -140,59 +166,107 @@ class Manager:
         """
         Generate a plan of actions by checking recent emails against rules.
         """
-        items, _ = search_messages(self._client, SearchFilters(newer_than_days=newer_than_days, unread_only=False))
-        
-        logger.info(f"Checking {len(items)} recent messages against {len(self._config.print_rules)} rules.")
         if not self._config.print_rules:
             logger.info("No rules configured.")
             return []
 
-        from .models import EmailMessage, EmailContent
-        # Import Rule type for return annotation
-        from .rules import Rule
+        # Every page in the window, not just the first; pages are prefetched
+        # while the current one is matched. When all rules are sender-based,
+        # Gmail prefilters to those senders; first_match still decides.
+        filters = SearchFilters(
+            text=self._rules_engine.gmail_query(),
+            newer_than_days=newer_than_days,
+            unread_only=False,
+        )
+        items = iter_messages(self._client, filters)
 
+        fields = self._rules_engine.required_fields
         matches = []
         for item in items:
-            partial_msg = EmailMessage(
-                message_id=item.message_id,
-                thread_id=item.thread_id,
-                from_email=item.from_email,
-                to_emails=(),
-                subject=item.subject,
-                date=item.date,
-                snippet=item.snippet,
-                labels=frozenset(item.label_ids),
-                content=EmailContent(),
-                has_attachments=False,
-                attachment_count=0
-            )
-
-            matched_rule = self._rules_engine.first_match(partial_msg)
+            matched_rule = self._rules_engine.first_match(_matchable(item, fields))
             if matched_rule:
                 matches.append((item, matched_rule))
-        
+
+        logger.info(f"{len(matches)} recent messages matched {len(self._config.print_rules)} rules.")
         return matches
 
-    def execute_automation_plan(self, plan: list[tuple[GmailMessageSummary, "Rule"]]) -> None: # type: ignore
+    def execute_automation_plan(self, plan: list[tuple[GmailMessageSummary, Rule]]) -> None:
         """
         Execute the actions in the plan.
+        Archive and delete are applied with one batched label change each;
+        print jobs and ClickUp tasks are submitted concurrently.
         """
+        archive_ids: list[str] = []
+        trash_ids: list[str] = []
+        print_ids: list[str] = []
+        clickup_items: list[GmailMessageSummary] = []
         for item, rule in plan:
             logger.info(f"Executing plan: Rule '{rule.name}' matched message {item.message_id}")
-            self.execute_action(item.message_id, rule.action, rule.name)
+            if rule.action == "archive":
+                archive_ids.append(item.message_id)
+            elif rule.action == "delete":
+                trash_ids.append(item.message_id)
+            elif rule.action == "print":
+                print_ids.append(item.message_id)
+            elif rule.action == "clickup":
+                clickup_items.append(item)
+            else:
+                self.execute_action(item.message_id, rule.action, rule.name)
+
+        if archive_ids:
+            logger.info(f"Archiving {len(archive_ids)} messages.")
+            self._client.batch_modify_labels(archive_ids, remove=["INBOX"])
+        if trash_ids:
+            logger.info(f"Trashing {len(trash_ids)} messages.")
+            self._client.batch_modify_labels(trash_ids, add=["TRASH"])
+        if print_ids:
+            self._print_messages(print_ids)
+        if clickup_items:
+            self._create_clickup_tasks(clickup_items)
+
+    def _print_messages(self, message_ids: list[str], max_workers: int = 4) -> None:
+        from .actions.print_action import print_email, PrintConfig
+
+        pconf = PrintConfig(printer_name=self._config.printer_name)
+
+        def _fetch_and_print(message_id: str) -> None:
+            # GmailClient keeps one service per thread, so fetches overlap too.
+            print_email(self._client.get_message_full(message_id), pconf)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(message_ids))) as executor:
+            futures = [executor.submit(_fetch_and_print, mid) for mid in message_ids]
+            for mid, future in zip(message_ids, futures):
+                try:
+                    future.result()
+                    logger.info(f"Print job sent for message {mid}.")
+                except Exception as e:
+                    logger.error(f"Failed to print message {mid}: {e}")
+
+    def _create_clickup_tasks(self, items: list[GmailMessageSummary]) -> None:
+        from .actions.clickup_action import create_tasks_from_emails, get_clickup_config
+        cfg = get_clickup_config()
+        if not cfg:
+            logger.error("ClickUp configuration missing (env vars). Cannot create tasks.")
+            return
+
+        results = create_tasks_from_emails([_partial_message(item) for item in items], cfg)
+        failed = results.count(False)
+        if failed:
+            logger.error(f"{failed} of {len(results)} ClickUp tasks could not be created.")
 
     def run_daily_automation(self, dry_run: bool = False) -> None:
         """
         Check recent emails against rules and execute actions.
         """
         plan = self.get_automation_plan()
-        
+
+        if not dry_run:
+            # Print and ClickUp actions are submitted concurrently.
+            self.execute_automation_plan(plan)
+            return
+
         for item, rule in plan:
-            if not dry_run:
-                logger.info(f"Match: Rule '{rule.name}' matched message {item.message_id}")
-                self.execute_action(item.message_id, rule.action, rule.name)
-            else:
-                logger.info(f"Dry run: matched action {rule.action} for rule {rule.name}")
+            logger.info(f"Dry run: matched action {rule.action} for rule {rule.name}")
 
     def preview_rule(self, rule_config: "PrintRule", lookback_days: int = 7) -> list[GmailMessageSummary]:
         """
@@ -208,23 +282,9 @@ class Manager:
         # Convert config to matching rule
         rule = rule_from_config(rule_config)
         
-        from .models import EmailMessage, EmailContent
         matches = []
         for item in items:
-             partial_msg = EmailMessage(
-                message_id=item.message_id,
-                thread_id=item.thread_id,
-                from_email=item.from_email,
-                to_emails=(),
-                subject=item.subject,
-                date=item.date,
-                snippet=item.snippet,
-                labels=frozenset(item.label_ids),
-                content=EmailContent(),
-                has_attachments=False,
-                attachment_count=0
-            )
-             if rule.predicate(partial_msg):
-                 matches.append(item)
+            if rule.predicate(_matchable(item, rule.fields)):
+                matches.append(item)
         
         return matches
@@ -1,28 +1,124 @@
 from __future__ import annotations
 
+import functools
+import heapq
 from dataclasses import dataclass
-from typing import Callable, Iterable, Optional
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple, Optional
 
 from .models import EmailMessage
 
+if TYPE_CHECKING:
+    from .config import MatchCriteria, PrintRule
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Rule:
     name: str
     predicate: Callable[[EmailMessage], bool]
     action: str  # "print", "archive", "delete", "clickup"
+    # Sender domain this rule requires, if any. The predicate still checks it;
+    # RulesEngine uses it to skip rules that cannot match a message.
+    from_domain: Optional[str] = None
+    # Gmail search fragment that every matching message satisfies (a superset
+    # of the predicate), or None if the rule cannot be expressed server-side.
+    gmail_query: Optional[str] = None
+    # Message attributes the predicate reads, or None if unknown (custom predicate).
+    fields: Optional[frozenset[str]] = None
+    # Same check as predicate, over a prelowered MessageView. Optional; when
+    # every rule has one, RulesEngine lowercases each message only once.
+    view_predicate: Optional[Callable[["MessageView"], bool]] = None
+
+
+def _sender_domain(from_email: str) -> str:
+    # "user@example.com" / "Name <user@example.com>" -> "example.com"
+    if "@" not in from_email:
+        return ""
+    return from_email.rsplit("@", 1)[1].strip().rstrip(">").lower()
+
+
+class MessageView(NamedTuple):
+    """
+    The message fields rules compare, normalized once per message.
+    """
+    from_l: str
+    domain: str
+    subject_l: str
+
+    @staticmethod
+    def of(msg: EmailMessage) -> "MessageView":
+        from_l = msg.from_email.strip().lower()
+        return MessageView(from_l, _sender_domain(from_l), (msg.subject or "").lower())
 
 
 class RulesEngine:
     def __init__(self, rules: Iterable[Rule]) -> None:
         self._rules = list(rules)
+        # Index rules by required sender domain; each entry keeps its position
+        # so first-match order is preserved when merging with unindexed rules.
+        by_domain: dict[str, list[tuple[int, Rule]]] = {}
+        unindexed: list[tuple[int, Rule]] = []
+        for i, rule in enumerate(self._rules):
+            if rule.from_domain:
+                by_domain.setdefault(rule.from_domain.strip().lower(), []).append((i, rule))
+            else:
+                unindexed.append((i, rule))
 
-    def first_match(self, msg: EmailMessage) -> Optional[Rule]:
+        # Union of the attributes every rule reads; None if any rule is opaque.
+        self.required_fields: Optional[frozenset[str]] = frozenset()
         for rule in self._rules:
-            if rule.predicate(msg):
+            if rule.fields is None:
+                self.required_fields = None
+                break
+            self.required_fields |= rule.fields
+
+        self._use_views = bool(self._rules) and all(r.view_predicate is not None for r in self._rules)
+
+        # Candidate lists are merged once here, not per message, and hold
+        # (check, rule) pairs so first_match does no attribute lookups.
+        def compiled(entries: Iterable[tuple[int, Rule]]) -> tuple[tuple[Callable, Rule], ...]:
+            if self._use_views:
+                return tuple((rule.view_predicate, rule) for _, rule in entries)
+            return tuple((rule.predicate, rule) for _, rule in entries)
+
+        self._unindexed = compiled(unindexed)
+        self._by_domain = {
+            domain: compiled(heapq.merge(entries, unindexed))
+            for domain, entries in by_domain.items()
+        }
+
+    def gmail_query(self) -> Optional[str]:
+        """
+        OR of all rules' Gmail fragments, for narrowing a search server-side.
+        None when any rule has no fragment (a broad fetch is needed).
+        """
+        fragments = [rule.gmail_query for rule in self._rules]
+        if not fragments or None in fragments:
+            return None
+        unique = list(dict.fromkeys(fragments))
+        if len(unique) == 1:
+            return unique[0]
+        return "{" + " ".join(unique) + "}"
+
+    def first_match(self, msg: EmailMessage) -> Optional[Rule]:
+        if self._use_views:
+            arg = MessageView.of(msg)
+            domain = arg.domain
+        else:
+            arg = msg
+            domain = _sender_domain(msg.from_email)
+
+        for check, rule in self._by_domain.get(domain, self._unindexed):
+            if check(arg):
                 return rule
         return None
 
+    def first_match_batch(self, msgs: Iterable[EmailMessage]) -> list[Optional[Rule]]:
+        """
+        first_match for each message, in order.
+        """
+        first_match = self.first_match
+        return [first_match(msg) for msg in msgs]
+
 
 def match_from_exact(addr: str) -> Callable[[EmailMessage], bool]:
     addr_l = addr.strip().lower()
@@ -56,40 +152,134 @@ def match_from_domain(domain: str) -> Callable[[EmailMessage], bool]:
     domain_l = domain.strip().lower()
 
     def _pred(msg: EmailMessage) -> bool:
-        return f"@{domain_l}" in msg.from_email.lower()
-    
+        return _sender_domain(msg.from_email) == domain_l
+
     return _pred
 
 
 def all_of(*preds: Callable[[EmailMessage], bool]) -> Callable[[EmailMessage], bool]:
-    def _pred(msg: EmailMessage) -> bool:
-        return all(p(msg) for p in preds)
+    # Unrolled for the common small cases; avoids a generator per message.
+    if len(preds) == 1:
+        return preds[0]
+
+    if len(preds) == 2:
+        p0, p1 = preds
+
+        def _pred(msg: EmailMessage) -> bool:
+            return p0(msg) and p1(msg)
+
+    elif len(preds) == 3:
+        p0, p1, p2 = preds
+
+        def _pred(msg: EmailMessage) -> bool:
+            return p0(msg) and p1(msg) and p2(msg)
+
+    else:
+        def _pred(msg: EmailMessage) -> bool:
+            for p in preds:
+                if not p(msg):
+                    return False
+            return True
 
     return _pred
 
 
-def rule_from_config(pr: "PrintRule") -> Rule: 
-    # lazy import to avoid circular dependency
-    from .config import PrintRule 
-    
+def _never(msg: EmailMessage) -> bool:
+    return False
+
+
+def compile_match(m: "MatchCriteria") -> Callable[[EmailMessage], bool]:
+    """
+    Specialize match criteria into a predicate at load time.
+    Only the fields that are set contribute a check, and a single check is
+    returned as-is rather than wrapped in all_of().
+    """
     preds = []
-    m = pr.match
-    
+
     if m.from_exact:
         preds.append(match_from_exact(m.from_exact))
-    
+
     if m.from_domain:
         preds.append(match_from_domain(m.from_domain))
-        
+
     if m.subject_contains:
         preds.append(subject_contains(m.subject_contains))
-        
+
     if m.subject_excludes:
         preds.append(subject_excludes(m.subject_excludes))
-        
+
     if not preds:
-        predicate = lambda m: False
-    else:
-        predicate = all_of(*preds)
-        
-    return Rule(name=pr.name, predicate=predicate, action=pr.action)
+        return _never
+    if len(preds) == 1:
+        return preds[0]
+    return all_of(*preds)
+
+
+def compile_view_match(m: "MatchCriteria") -> Callable[[MessageView], bool]:
+    """
+    compile_match() over a MessageView: needles are lowered here, message
+    fields were lowered when the view was built.
+    """
+    preds = []
+
+    if m.from_exact:
+        addr_l = m.from_exact.strip().lower()
+        preds.append(lambda v: v.from_l == addr_l)
+
+    if m.from_domain:
+        domain_l = m.from_domain.strip().lower()
+        preds.append(lambda v: v.domain == domain_l)
+
+    if m.subject_contains:
+        contains_l = m.subject_contains.lower()
+        preds.append(lambda v: contains_l in v.subject_l)
+
+    if m.subject_excludes:
+        excludes_l = m.subject_excludes.lower()
+        preds.append(lambda v: excludes_l not in v.subject_l)
+
+    if not preds:
+        return _never
+    if len(preds) == 1:
+        return preds[0]
+    return all_of(*preds)
+
+
+def match_fields(m: "MatchCriteria") -> frozenset[str]:
+    """
+    Message attributes read by the predicate compile_match() builds for m.
+    """
+    fields = set()
+    if m.from_exact or m.from_domain:
+        fields.add("from_email")
+    if m.subject_contains or m.subject_excludes:
+        fields.add("subject")
+    return frozenset(fields)
+
+
+def gmail_query_fragment(m: "MatchCriteria") -> Optional[str]:
+    """
+    Server-side prefilter for match criteria, from the sender fields only.
+    Subject checks are left to the predicate: Gmail's subject: operator
+    matches whole words, which would miss substring matches.
+    """
+    if m.from_exact:
+        return f'from:"{m.from_exact.strip()}"'
+    if m.from_domain:
+        return f'from:"{m.from_domain.strip()}"'
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def rule_from_config(pr: "PrintRule") -> Rule:
+    # PrintRule is frozen and hashable; repeated previews of the same rule and
+    # reloads of an unchanged config reuse the compiled Rule.
+    return Rule(
+        name=pr.name,
+        predicate=compile_match(pr.match),
+        action=pr.action,
+        from_domain=pr.match.from_domain,
+        gmail_query=gmail_query_fragment(pr.match),
+        fields=match_fields(pr.match),
+        view_predicate=compile_view_match(pr.match),
+    )
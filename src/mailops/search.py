@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
-from .gmail_client import GmailClient, GmailMessageSummary
+if TYPE_CHECKING:
+    from .gmail_client import GmailClient, GmailMessageSummary
 
 
 @dataclass(frozen=True)
@@ -19,9 +21,12 @@ class SearchFilters:
     inbox_only: bool = True
 
 
+@functools.lru_cache(maxsize=32)
 def build_gmail_query(filters: SearchFilters) -> str:
     """
     Convert SearchFilters into a Gmail query string.
+    Cached per (frozen, hashable) filters value, so paging and re-running the
+    same search reuse the query string.
     """
     parts: list[str] = []
 
@@ -57,3 +62,15 @@ def search_messages(
     """
     query = build_gmail_query(filters)
     return client.search_messages(query, max_results=max_results, page_token=page_token)
+
+
+def iter_messages(
+    client: GmailClient,
+    filters: SearchFilters,
+    *,
+    page_size: int = 100,
+) -> Iterator[GmailMessageSummary]:
+    """
+    Iterate over all messages matching the filters, following page tokens.
+    """
+    return client.iter_messages(build_gmail_query(filters), page_size=page_size)
@@ -1,36 +1,134 @@
+import gzip
+import hashlib
 import http.server
-import socketserver
 import json
 import logging
 import os
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+from urllib.parse import parse_qs, urlsplit
 
 from .config import load_config, save_config, AppConfig, PrintRule, MatchCriteria
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # optional: pip install mailops[fastjson]
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    # Message dates are datetimes; match orjson's RFC 3339 output.
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_json_default)
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _encoder.encode(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 PORT = 8000
 WEB_ROOT = Path(__file__).parent / "web"
 
+# lpstat forks a process; printer lists change rarely, so reuse the last
+# answer for a short while unless the user explicitly refreshes.
+_PRINTERS_TTL = 30.0
+_printers_cache: tuple[float, list[str]] | None = None
+_printers_lock = threading.Lock()
+
+
+def _get_printers(force: bool = False) -> list[str]:
+    global _printers_cache
+    from .actions.print_action import get_available_printers, invalidate_printer_cache
+
+    with _printers_lock:
+        now = time.monotonic()
+        if not force and _printers_cache is not None and now - _printers_cache[0] < _PRINTERS_TTL:
+            return _printers_cache[1]
+        # print_action memoizes lpstat without expiry; clear it so an expired
+        # or forced refresh really re-runs lpstat.
+        invalidate_printer_cache()
+        printers = get_available_printers()
+        _printers_cache = (now, printers)
+        return printers
+
+# Bodies smaller than this gain nothing from gzip.
+_GZIP_MIN_SIZE = 256
+
+# One Manager shared by all request threads; building it loads the config
+# and the Gmail client, which is far too slow to do per preview click.
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def _get_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from .manager import Manager
+            _manager = Manager()
+        return _manager
+
+
+def _reset_manager() -> None:
+    # Called after the config is saved so the next request sees the new rules.
+    global _manager
+    with _manager_lock:
+        _manager = None
+
 # Embedded HTML to avoid file management for now, or we can write it to a file.
 # Let's write a simple HTML file.
 
 class MailOpsRequestHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         if self.path == "/" or self.path == "/index.html":
-            self.send_response(200)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            self.wfile.write(self.get_html().encode("utf-8"))
+            if self.headers.get("If-None-Match") == _HTML_ETAG:
+                self.send_response(304)
+                self.send_header("ETag", _HTML_ETAG)
+                self.end_headers()
+                return
+            self._send_body(
+                _HTML_BYTES,
+                "text/html; charset=utf-8",
+                gzipped=_HTML_GZ,
+                headers={"ETag": _HTML_ETAG, "Cache-Control": "public, max-age=60"},
+            )
             return
 
         if self.path == "/api/config":
             cfg = load_config()
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(cfg.to_dict()).encode("utf-8"))
+            self._send_body(_dumps(cfg.to_dict()), "application/json")
+            return
+
+        url = urlsplit(self.path)
+        if url.path == "/api/printers":
+            force = parse_qs(url.query).get("force", ["0"])[0] not in ("", "0")
+            try:
+                printers = _get_printers(force=force)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self.send_response(500)
+                self.send_header("Content-type", "application/json")
+                self.end_headers()
+                self.wfile.write(_dumps({"error": str(e)}))
+                return
+            self._send_body(_dumps(printers), "application/json")
             return
             
         self.send_error(404)
@@ -40,10 +138,11 @@ class MailOpsRequestHandler(http.server.SimpleHTTPRequestHandler):
             length = int(self.headers.get("content-length", 0))
             data = self.rfile.read(length)
             try:
-                payload = json.loads(data)
+                payload = _loads(data)
                 # Validation happens in from_dict
                 cfg = AppConfig.from_dict(payload)
                 save_config(cfg)
+                _reset_manager()
                 self.send_response(200)
                 self.send_header("Content-type", "application/json")
                 self.end_headers()
@@ -56,55 +155,82 @@ class MailOpsRequestHandler(http.server.SimpleHTTPRequestHandler):
             length = int(self.headers.get("content-length", 0))
             data = self.rfile.read(length)
             try:
-                payload = json.loads(data)
+                payload = _loads(data)
                 # payload is a PrintRule dict
                 rule = PrintRule.from_dict(payload)
                 
-                from .manager import Manager
-                mgr = Manager()
-                matches = mgr.preview_rule(rule)
-                
-                # return simplified list
-                res_data = [
-                    {
-                        "message_id": m.message_id, 
-                        "subject": m.subject, 
-                        "from": m.from_email,
-                        "date": m.date
-                    } 
-                    for m in matches
-                ]
-                
-                self.send_response(200)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps(res_data).encode("utf-8"))
+                matches = _get_manager().preview_rule(rule)
             except Exception as e:
                 import traceback
                 traceback.print_exc()
                 self.send_error(400, f"Error: {e}")
-            return
+                return
 
-        if self.path == "/api/printers":
-            try:
-                from .actions.print_action import get_available_printers
-                printers = get_available_printers()
-                self.send_response(200)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps(printers).encode("utf-8"))
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                self.send_response(500)
-                self.send_header("Content-type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode("utf-8"))
+            # return simplified list
+            self._send_json_array(
+                {
+                    "message_id": m.message_id,
+                    "subject": m.subject,
+                    "from": m.from_email,
+                    "date": m.date
+                }
+                for m in matches
+            )
             return
-            
+
         self.send_error(404)
         
-    def get_html(self) -> str:
+    def _accepts_gzip(self) -> bool:
+        return "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def _send_body(
+        self,
+        body: bytes,
+        content_type: str,
+        gzipped: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Send a complete 200 response, gzip-compressed when the client accepts it.
+        `gzipped` is an optional precompressed copy of `body`.
+        """
+        self.send_response(200)
+        self.send_header("Content-type", content_type)
+        self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self._accepts_gzip() and (gzipped is not None or len(body) >= _GZIP_MIN_SIZE):
+            body = gzipped if gzipped is not None else gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json_array(self, rows: Iterable[Any]) -> None:
+        """
+        Write a JSON array element by element, so the response body is never
+        built in memory. The body is delimited by closing the connection.
+        """
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Vary", "Accept-Encoding")
+        use_gzip = self._accepts_gzip()
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        # GzipFile writes its header on construction, so open it after ours.
+        out = gzip.GzipFile(fileobj=self.wfile, mode="wb", compresslevel=5) if use_gzip else self.wfile
+        out.write(b"[")
+        for i, row in enumerate(rows):
+            if i:
+                out.write(b",")
+            out.write(_dumps(row))
+        out.write(b"]")
+        if out is not self.wfile:
+            out.close()
+
+    @staticmethod
+    def get_html() -> str:
         return """
 <!DOCTYPE html>
 <html lang="en">
@@ -144,7 +270,7 @@ class MailOpsRequestHandler(http.server.SimpleHTTPRequestHandler):
                     </select>
                     <input type="text" v-model="config.printer_name" v-else placeholder="Printer system name (e.g. HP_OfficeJet)">
                     
-                    <button class="btn btn-test" @click="fetchPrinters" title="Refresh Printers">&#x21bb;</button>
+                    <button class="btn btn-test" @click="fetchPrinters(true)" title="Refresh Printers">&#x21bb;</button>
                 </div>
             </div>
             
@@ -237,11 +363,11 @@ class MailOpsRequestHandler(http.server.SimpleHTTPRequestHandler):
                     .catch(err => console.error(err));
             },
             methods: {
-                fetchPrinters() {
+                fetchPrinters(force) {
                     const btn = document.querySelector('.btn-test[title="Refresh Printers"]');
                     if(btn) btn.textContent = "...";
                     
-                    fetch('/api/printers')
+                    fetch(force ? '/api/printers?force=1' : '/api/printers')
                         .then(res => res.json())
                         .then(data => {
                             this.printers = data;
@@ -316,10 +442,24 @@ class MailOpsRequestHandler(http.server.SimpleHTTPRequestHandler):
 </html>
         """
 
+_HTML_BYTES = MailOpsRequestHandler.get_html().encode("utf-8")
+# The page never changes at runtime, so compress it once at import.
+_HTML_GZ = gzip.compress(_HTML_BYTES, compresslevel=9)
+_HTML_ETAG = '"' + hashlib.md5(_HTML_BYTES).hexdigest() + '"'
+
+def make_server(port: int = PORT, host: str = "") -> http.server.ThreadingHTTPServer:
+    """
+    Threaded server: a slow /api/preview no longer blocks config or page loads.
+    """
+    httpd = http.server.ThreadingHTTPServer((host, port), MailOpsRequestHandler)
+    httpd.daemon_threads = True
+    return httpd
+
+
 def run_server(port: int = PORT):
     print(f"Starting MailOps Dashboard at http://localhost:{port}")
     try:
-        with socketserver.TCPServer(("", port), MailOpsRequestHandler) as httpd:
+        with make_server(port) as httpd:
             try:
                 httpd.serve_forever()
             except KeyboardInterrupt:
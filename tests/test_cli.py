@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from mailops.cli import _parse_selection
+
+
+def test_parse_selection_basic():
+    assert _parse_selection("1,3,5", max_n=5) == [1, 3, 5]
+
+
+def test_parse_selection_ignores_whitespace_and_empty_parts():
+    assert _parse_selection(" 2 , ,4,", max_n=5) == [2, 4]
+
+
+def test_parse_selection_dedupes_preserving_order():
+    assert _parse_selection("3,1,3,1", max_n=5) == [3, 1]
+
+
+def test_parse_selection_drops_out_of_range_and_invalid_tokens():
+    assert _parse_selection("0,2,6,x,4a", max_n=5) == [2]
+
+
+def test_parse_selection_rejects_non_numeric_commands():
+    assert _parse_selection("hello", max_n=5) == []
+    assert _parse_selection("1 3", max_n=5) == []
+
+
+def test_print_results_lists_items(capsys):
+    from mailops.cli import _print_results
+    from mailops.gmail_client import GmailMessageSummary
+
+    items = [
+        GmailMessageSummary(
+            message_id="m1", thread_id=None, from_email="a@example.com",
+            subject=" Hello ", date=None, snippet="", label_ids=()
+        ),
+        GmailMessageSummary(
+            message_id="m2", thread_id=None, from_email="",
+            subject="", date=None, snippet="", label_ids=()
+        ),
+    ]
+    _print_results(items)
+
+    out = capsys.readouterr().out
+    assert out == (
+        "\nResults:\n\n"
+        " 1. Hello  |  a@example.com\n"
+        " 2. (no subject)  |  (unknown sender)\n"
+        "\n"
+    )
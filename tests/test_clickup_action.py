@@ -1,8 +1,8 @@
-import json
-import urllib.error
 from unittest.mock import MagicMock, patch
 import pytest
+import requests
 
+from mailops.actions import clickup_action
 from mailops.actions.clickup_action import create_task_from_email, ClickUpConfig
 from mailops.models import EmailMessage, EmailContent
 
@@ -13,22 +13,20 @@ def test_create_task_sends_request():
         content=EmailContent(), has_attachments=False, attachment_count=0
     )
     config = ClickUpConfig(api_key="key", list_id="123")
-    
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"id":"task1"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-        
+
+    mock_session = MagicMock()
+    mock_session.post.return_value.status_code = 200
+    mock_session.post.return_value.content = b'{"id":"task1"}'
+
+    with patch.object(clickup_action, "_get_session", return_value=mock_session):
         create_task_from_email(msg, config)
-        
-        mock_urlopen.assert_called_once()
-        req = mock_urlopen.call_args[0][0]
-        assert req.get_full_url() == "https://api.clickup.com/api/v2/list/123/task"
-        assert req.get_header("Authorization") == "key"
-        
+
+        mock_session.post.assert_called_once()
+        args, kwargs = mock_session.post.call_args
+        assert args[0] == "https://api.clickup.com/api/v2/list/123/task"
+
         # Verify payload
-        data = json.loads(req.data)
+        data = kwargs["json"]
         assert data["name"] == "Task Subject"
         assert "Snippet" in data["description"]
 
@@ -39,14 +37,96 @@ def test_create_task_handles_error():
         content=EmailContent(), has_attachments=False, attachment_count=0
     )
     config = ClickUpConfig(api_key="key", list_id="123")
-    
-    with patch("urllib.request.urlopen") as mock_urlopen:
-        # Simulate HTTP Error
-        err = urllib.error.HTTPError(
-            url="url", code=401, msg="Unauthorized", hdrs={}, fp=MagicMock()
+
+    # Simulate HTTP Error
+    response = requests.Response()
+    response.status_code = 401
+    response._content = b"Unauthorized"
+    mock_session = MagicMock()
+    mock_session.post.return_value = response
+
+    with patch.object(clickup_action, "_get_session", return_value=mock_session):
+        with pytest.raises(requests.HTTPError):
+            create_task_from_email(msg, config)
+
+def test_session_is_reused_per_api_key():
+    config = ClickUpConfig(api_key="reuse-key", list_id="123")
+
+    s1 = clickup_action._get_session(config)
+    s2 = clickup_action._get_session(ClickUpConfig(api_key="reuse-key", list_id="456"))
+
+    assert s1 is s2
+    assert s1.headers["Authorization"] == "reuse-key"
+    assert s1.headers["Content-Type"] == "application/json"
+
+def test_create_tasks_from_emails_reports_per_message_results():
+    msgs = [
+        EmailMessage(
+            message_id=str(i), thread_id=None, from_email="u@example.com", to_emails=(),
+            subject=f"Task {i}", date=None, snippet="", labels=(),
+            content=EmailContent(), has_attachments=False, attachment_count=0
         )
-        err.fp.read.return_value = b"Unauthorized"
-        mock_urlopen.side_effect = err
-        
-        with pytest.raises(urllib.error.HTTPError):
+        for i in range(3)
+    ]
+    config = ClickUpConfig(api_key="key", list_id="123")
+
+    def fake_create(msg, cfg):
+        if msg.message_id == "1":
+            raise RuntimeError("boom")
+
+    with patch.object(clickup_action, "create_task_from_email", side_effect=fake_create) as mock_create:
+        results = clickup_action.create_tasks_from_emails(msgs, config)
+
+    assert results == [True, False, True]
+    assert mock_create.call_count == 3
+
+def test_create_task_reconnects_once_after_connect_failure():
+    from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+    msg = EmailMessage(
+        message_id="1", thread_id=None, from_email="u@example.com", to_emails=(),
+        subject="Task", date=None, snippet="", labels=(),
+        content=EmailContent(), has_attachments=False, attachment_count=0
+    )
+    config = ClickUpConfig(api_key="key", list_id="123")
+
+    refused = MaxRetryError(None, "/task", NewConnectionError(None, "Connection refused"))
+    stale = MagicMock()
+    stale.post.side_effect = requests.ConnectionError(refused)
+    fresh = MagicMock()
+    fresh.post.return_value.status_code = 200
+
+    with patch.object(clickup_action, "_get_session", return_value=stale), \
+            patch.object(clickup_action, "_reset_session", return_value=fresh) as mock_reset:
+        create_task_from_email(msg, config)
+
+    mock_reset.assert_called_once_with(config)
+    fresh.post.assert_called_once()
+
+def test_create_task_does_not_resend_after_mid_request_drop():
+    msg = EmailMessage(
+        message_id="1", thread_id=None, from_email="u@example.com", to_emails=(),
+        subject="Task", date=None, snippet="", labels=(),
+        content=EmailContent(), has_attachments=False, attachment_count=0
+    )
+    config = ClickUpConfig(api_key="key", list_id="123")
+
+    # The server may have created the task before the connection closed.
+    session = MagicMock()
+    session.post.side_effect = requests.ConnectionError("Remote end closed connection without response")
+
+    with patch.object(clickup_action, "_get_session", return_value=session), \
+            patch.object(clickup_action, "_reset_session") as mock_reset:
+        with pytest.raises(requests.ConnectionError):
             create_task_from_email(msg, config)
+
+    mock_reset.assert_not_called()
+    session.post.assert_called_once()
+
+def test_session_never_retries_post_after_it_may_have_been_processed():
+    retry = clickup_action._build_session("k").get_adapter("https://api.clickup.com").max_retries
+
+    assert retry.read == 0
+    assert retry.other == 0
+    assert set(retry.status_forcelist) == {429}
+    assert retry.respect_retry_after_header
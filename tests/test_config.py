@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from mailops.config import AppConfig, MatchCriteria, PrintRule, add_rule, load_config, save_config
+from mailops.config import AppConfig, MatchCriteria, PrintRule, add_rule, load_config, reload_config, save_config
 
 
 def test_load_config_returns_default_when_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
@@ -105,3 +105,34 @@ def test_load_config_rejects_missing_rule_name(tmp_path: Path, monkeypatch: pyte
     with pytest.raises(ValueError) as e:
         load_config()
     assert "name" in str(e.value).lower()
+
+
+def test_load_config_is_cached_until_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cfg_path = tmp_path / "config.json"
+    monkeypatch.setenv("MAILOPS_CONFIG_PATH", str(cfg_path))
+
+    save_config(AppConfig(printer_name="First", print_rules=()))
+    cfg1 = load_config()
+    assert load_config() is cfg1
+
+    save_config(AppConfig(printer_name="Second", print_rules=()))
+    cfg2 = load_config()
+    assert cfg2.printer_name == "Second"
+
+    cfg_path.write_text(json.dumps({"printer_name": "External"}), encoding="utf-8")
+    assert reload_config().printer_name == "External"
+
+
+def test_concurrent_saves_leave_a_complete_config(tmp_path: Path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    cfg_path = tmp_path / "config.json"
+    configs = [AppConfig(printer_name=f"P{i}", print_rules=()) for i in range(16)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda c: save_config(c, cfg_path), configs))
+
+    saved = json.loads(cfg_path.read_text(encoding="utf-8"))
+    assert saved["printer_name"] in {c.printer_name for c in configs}
+    # No temp files are left behind.
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
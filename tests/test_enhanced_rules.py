@@ -1,4 +1,4 @@
-from mailops.rules import rule_from_config, subject_excludes, match_from_domain
+from mailops.rules import compile_match, rule_from_config, subject_excludes, match_from_domain
 from mailops.config import PrintRule, MatchCriteria
 from mailops.models import EmailMessage, EmailContent
 
@@ -75,3 +75,27 @@ def test_rule_factory_composition():
         content=EmailContent(), has_attachments=False, attachment_count=0
     )
     assert rule.predicate(msg3) is False
+
+def test_compile_match_specializes_on_set_fields():
+    msg = EmailMessage(
+        message_id="1", thread_id=None, from_email="a@example.com", to_emails=(),
+        subject="Update", date=None, snippet="", labels=frozenset(),
+        content=EmailContent(), has_attachments=False, attachment_count=0
+    )
+
+    # No usable fields -> never matches
+    assert compile_match(MatchCriteria())(msg) is False
+
+    # Single field -> plain predicate, still correct
+    pred = compile_match(MatchCriteria(from_domain="example.com"))
+    assert pred(msg) is True
+    assert compile_match(MatchCriteria(from_domain="other.com"))(msg) is False
+
+def test_rule_from_config_reuses_compiled_rule():
+    pr1 = PrintRule(name="Same", action="print", match=MatchCriteria(from_domain="example.com"))
+    pr2 = PrintRule(name="Same", action="print", match=MatchCriteria(from_domain="example.com"))
+
+    assert rule_from_config(pr1) is rule_from_config(pr2)
+    assert rule_from_config(pr1) is not rule_from_config(
+        PrintRule(name="Same", action="archive", match=pr1.match)
+    )
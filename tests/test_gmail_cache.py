@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from mailops.gmail_cache import HeaderCache
+
+
+def _msg(mid: str, labels: list[str]) -> dict:
+    return {
+        "id": mid,
+        "threadId": "t-" + mid,
+        "snippet": "hello",
+        "labelIds": labels,
+        "payload": {"headers": [{"name": "Subject", "value": "Café"}]},
+    }
+
+
+def test_header_cache_round_trips_and_persists(tmp_path: Path):
+    path = tmp_path / "headers.sqlite"
+    cache = HeaderCache(path)
+    cache.put_many([_msg("a", ["INBOX", "UNREAD"]), _msg("b", [])])
+    cache.close()
+
+    reopened = HeaderCache(path)
+    assert reopened.get_many(["a", "b", "missing"]) == {"a": _msg("a", ["INBOX", "UNREAD"]), "b": _msg("b", [])}
+    assert reopened.get("missing") is None
+
+
+def test_header_cache_updates_labels_only(tmp_path: Path):
+    cache = HeaderCache(tmp_path / "headers.sqlite")
+    cache.put_many([_msg("a", ["INBOX", "UNREAD"])])
+
+    cache.update_labels(["a", "not-cached"], add=["TRASH"], remove=["UNREAD"])
+
+    assert cache.get("a") == _msg("a", ["INBOX", "TRASH"])
+    assert cache.get("not-cached") is None
+
+
+def test_header_cache_expires_labels_and_evicts_old_rows(tmp_path: Path, monkeypatch):
+    import mailops.gmail_cache as cache_mod
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+
+    path = tmp_path / "headers.sqlite"
+    cache = HeaderCache(path, label_ttl=60, max_age=3600)
+    cache.put_many([_msg("a", ["INBOX"])])
+
+    now[0] += 30
+    assert cache.get("a") == _msg("a", ["INBOX"])
+
+    # Labels may have changed in Gmail since; the entry is a miss until refetched.
+    now[0] += 60
+    assert cache.get("a") is None
+    cache.put_many([_msg("a", [])])
+    assert cache.get("a") == _msg("a", [])
+    cache.close()
+
+    now[0] += 3601
+    reopened = HeaderCache(path, label_ttl=10**9, max_age=3600)
+    assert reopened._read(["a"], min_labels_at=0) == {}
@@ -13,7 +13,7 @@ class _Req:
     def __init__(self, payload: dict[str, Any]):
         self._payload = payload
 
-    def execute(self) -> dict[str, Any]:
+    def execute(self, num_retries: int = 0) -> dict[str, Any]:
         return self._payload
 
 
@@ -21,12 +21,13 @@ class _MessagesAPI:
     def __init__(self, list_payload: dict[str, Any], get_payload_by_id: dict[str, dict[str, Any]]):
         self._list_payload = list_payload
         self._get_payload_by_id = get_payload_by_id
+        self.batch_modify_bodies: list[dict[str, Any]] = []
 
     def list(self, userId: str, q: str, maxResults: int, pageToken: Optional[str] = None):
         # We don't assert q/maxResults here; we just verify the call path works.
         return _Req(self._list_payload)
 
-    def get(self, userId: str, id: str, format: str, metadataHeaders: list[str]):
+    def get(self, userId: str, id: str, format: str, metadataHeaders: Optional[list[str]] = None):
         if id not in self._get_payload_by_id:
             raise KeyError(f"Missing fixture for id={id}")
         return _Req(self._get_payload_by_id[id])
@@ -35,6 +36,10 @@ class _MessagesAPI:
         # return an empty response payload
         return _Req({})
 
+    def batchModify(self, userId: str, body: dict[str, Any]):
+        self.batch_modify_bodies.append(body)
+        return _Req({})
+
 
 class _UsersAPI:
     def __init__(self, messages_api: _MessagesAPI):
@@ -44,13 +49,36 @@ class _UsersAPI:
         return self._messages_api
 
 
+class _Batch:
+    def __init__(self, callback, log: list[int]):
+        self._callback = callback
+        self._requests: list[tuple[str, _Req]] = []
+        self._log = log
+
+    def add(self, request: _Req, request_id: str):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._log.append(len(self._requests))
+        for request_id, request in self._requests:
+            try:
+                resp, exc = request.execute(), None
+            except Exception as e:
+                resp, exc = None, e
+            self._callback(request_id, resp, exc)
+
+
 class _Service:
     def __init__(self, users_api: _UsersAPI):
         self._users_api = users_api
+        self.batches: list[int] = []
 
     def users(self) -> _UsersAPI:
         return self._users_api
 
+    def new_batch_http_request(self, callback):
+        return _Batch(callback, self.batches)
+
 
 def _build_fake_client(monkeypatch: pytest.MonkeyPatch) -> gc.GmailClient:
     # Patch googleapiclient.discovery.build() to return our fake service.
@@ -89,9 +117,10 @@ def _build_fake_client(monkeypatch: pytest.MonkeyPatch) -> gc.GmailClient:
 
     svc = _Service(_UsersAPI(_MessagesAPI(list_payload, get_payload_by_id)))
 
-    def fake_build(api: str, version: str, credentials):
+    def fake_build(api: str, version: str, credentials, **kwargs):
         assert api == "gmail"
         assert version == "v1"
+        assert kwargs.get("static_discovery") is True
         return svc
 
     monkeypatch.setattr(gc, "build", fake_build)
@@ -129,3 +158,221 @@ def test_mark_read_calls_modify(monkeypatch: pytest.MonkeyPatch):
 
     # This just verifies the method path does not error with our fake service.
     client.mark_read("m1")
+
+
+def test_search_messages_fetches_summaries_in_one_batch(monkeypatch: pytest.MonkeyPatch):
+    client = _build_fake_client(monkeypatch)
+
+    client.search_messages("in:inbox", max_results=2)
+    assert client._svc.batches == [2]
+
+
+def test_batched_summary_errors_are_raised(monkeypatch: pytest.MonkeyPatch):
+    client = _build_fake_client(monkeypatch)
+
+    with pytest.raises(KeyError):
+        client.batch_get_message_summaries(["m1", "missing"])
+
+
+def test_service_is_built_per_thread(monkeypatch: pytest.MonkeyPatch):
+    import threading
+
+    client = _build_fake_client(monkeypatch)
+    built: list[object] = []
+
+    def fake_build(api: str, version: str, credentials, **kwargs):
+        svc = object()
+        built.append(svc)
+        return svc
+
+    monkeypatch.setattr(gc, "build", fake_build)
+    main_svc = client._svc
+
+    seen: list[object] = []
+    t = threading.Thread(target=lambda: seen.append(client._svc))
+    t.start()
+    t.join()
+
+    assert seen == built
+    assert seen[0] is not main_svc
+
+
+def test_get_message_full_walks_nested_parts_in_order(monkeypatch: pytest.MonkeyPatch):
+    import base64
+
+    def b64(text: str) -> str:
+        return base64.urlsafe_b64encode(text.encode()).decode()
+
+    client = _build_fake_client(monkeypatch)
+    client._svc.users().messages()._get_payload_by_id["nested"] = {
+        "id": "nested",
+        "payload": {
+            "mimeType": "multipart/mixed",
+            "headers": [{"name": "Subject", "value": "Nested"}],
+            "parts": [
+                {
+                    "mimeType": "multipart/alternative",
+                    "parts": [
+                        {"mimeType": "text/plain", "body": {"data": b64("first")}},
+                        {"mimeType": "text/html", "body": {"data": b64("<p>first</p>")}},
+                    ],
+                },
+                {"mimeType": "text/plain", "body": {"data": b64("second")}},
+                {"mimeType": "image/png", "body": {"data": "not base64 at all"}},
+            ],
+        },
+    }
+
+    msg = client.get_message_full("nested")
+    assert msg.subject == "Nested"
+    assert msg.content.text == "first\nsecond"
+    assert msg.content.html == "<p>first</p>"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Tue, 7 Jan 2026 09:21:00 -0500",
+        "7 Jan 2026 09:21:00 +0530 (IST)",
+        "Tue, 07 Jan 2026 09:21:00 GMT",
+        "Tue, 7 Jan 26 09:21 +0100",
+    ],
+)
+def test_parse_rfc2822_date_matches_email_utils(value: str):
+    from email.utils import parsedate_to_datetime
+
+    assert gc._parse_rfc2822_date(value) == parsedate_to_datetime(value)
+
+
+def test_parse_rfc2822_date_returns_none_for_invalid_values():
+    assert gc._parse_rfc2822_date("") is None
+    assert gc._parse_rfc2822_date("Wed, 31 Feb 2026 09:21:00 +0000") is None
+    assert gc._parse_rfc2822_date("Tue, 7 Jan 2026 09:21:00 +9999") is None
+
+
+def test_batch_modify_labels_chunks_ids(monkeypatch: pytest.MonkeyPatch):
+    client = _build_fake_client(monkeypatch)
+    monkeypatch.setattr(gc, "_BATCH_MODIFY_SIZE", 2)
+
+    client.batch_modify_labels(["a", "b", "c"], remove=["INBOX"])
+
+    bodies = client._svc.users().messages().batch_modify_bodies
+    assert [b["ids"] for b in bodies] == [["a", "b"], ["c"]]
+    assert all(b["removeLabelIds"] == ["INBOX"] and b["addLabelIds"] == [] for b in bodies)
+
+
+def test_iter_messages_follows_page_tokens(monkeypatch: pytest.MonkeyPatch):
+    client = _build_fake_client(monkeypatch)
+    messages_api = client._svc.users().messages()
+    pages = {
+        None: {"messages": [{"id": "m1"}], "nextPageToken": "P2"},
+        "P2": {"messages": [{"id": "m2"}]},
+    }
+    monkeypatch.setattr(
+        messages_api, "list",
+        lambda userId, q, maxResults, pageToken=None: _Req(pages[pageToken]),
+    )
+
+    assert [s.message_id for s in client.iter_messages("in:inbox")] == ["m1", "m2"]
+
+
+def test_batch_get_falls_back_to_single_gets_when_batch_fails(monkeypatch: pytest.MonkeyPatch):
+    client = _build_fake_client(monkeypatch)
+
+    def broken_execute(self):
+        raise ConnectionError("batch endpoint unavailable")
+
+    monkeypatch.setattr(_Batch, "execute", broken_execute)
+
+    import threading
+
+    threads: set[str] = set()
+    original_execute = _Req.execute
+
+    def recording_execute(self, num_retries: int = 0):
+        threads.add(threading.current_thread().name)
+        return original_execute(self, num_retries)
+
+    monkeypatch.setattr(_Req, "execute", recording_execute)
+
+    items = client.batch_get_message_summaries(["m2", "m1"])
+    assert [s.message_id for s in items] == ["m2", "m1"]
+    # The per-message fallback runs on pool threads, not serially on the caller.
+    assert threading.current_thread().name not in threads
+
+
+def test_from_oauth_cached_returns_one_client(monkeypatch: pytest.MonkeyPatch):
+    calls: list[int] = []
+
+    def fake_from_oauth():
+        calls.append(1)
+        return object()
+
+    monkeypatch.setattr(gc.GmailClient, "from_oauth", staticmethod(fake_from_oauth))
+    gc.GmailClient.from_oauth_cached.cache_clear()
+    try:
+        assert gc.GmailClient.from_oauth_cached() is gc.GmailClient.from_oauth_cached()
+        assert len(calls) == 1
+    finally:
+        gc.GmailClient.from_oauth_cached.cache_clear()
+
+
+def test_batch_get_retries_rate_limited_calls_with_smaller_batches(monkeypatch: pytest.MonkeyPatch):
+    import httplib2
+    from googleapiclient.errors import HttpError
+
+    client = _build_fake_client(monkeypatch)
+    messages_api = client._svc.users().messages()
+    real_get = messages_api.get
+    throttled_once: set[str] = set()
+
+    class _Throttled:
+        def execute(self, num_retries: int = 0):
+            raise HttpError(httplib2.Response({"status": 429}), b"rateLimitExceeded")
+
+    def flaky_get(userId, id, format, metadataHeaders=None):
+        if id == "m2" and id not in throttled_once:
+            throttled_once.add(id)
+            return _Throttled()
+        return real_get(userId, id, format, metadataHeaders)
+
+    sleeps: list[float] = []
+    monkeypatch.setattr(messages_api, "get", flaky_get)
+    monkeypatch.setattr(gc.time, "sleep", sleeps.append)
+
+    items = client.batch_get_message_summaries(["m1", "m2"])
+
+    assert [s.message_id for s in items] == ["m1", "m2"]
+    # Second round only re-sends the throttled id, after one backoff.
+    assert client._svc.batches == [2, 1]
+    assert len(sleeps) == 1
+    assert client._batch_size < gc._BATCH_SIZE
+
+
+def test_header_cache_skips_gmail_for_known_messages(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    from mailops.gmail_cache import HeaderCache
+
+    client = _build_fake_client(monkeypatch)
+    client._header_cache = HeaderCache(tmp_path / "headers.sqlite")
+
+    first = client.batch_get_message_summaries(["m1", "m2"])
+    assert client._svc.batches == [2]
+
+    # Headers are immutable; a warm cache answers without any request.
+    client._svc.users().messages()._get_payload_by_id.clear()
+    assert client.batch_get_message_summaries(["m1", "m2"]) == first
+    assert client.get_message_summary("m1") == first[0]
+    assert client._svc.batches == [2]
+
+    client.mark_read("m1")
+    assert "UNREAD" not in client.get_message_summary("m1").label_ids
+
+
+def test_orjson_model_matches_json_model():
+    pytest.importorskip("orjson")
+    from googleapiclient.model import JsonModel
+
+    content = '{"id": "m1", "snippet": "Café", "labelIds": ["INBOX"]}'.encode("utf-8")
+    assert gc._OrjsonModel().deserialize(content) == JsonModel().deserialize(content)
+    # Non-JSON bodies are passed through the same way as before.
+    assert gc._OrjsonModel().deserialize(b"not json") == JsonModel().deserialize(b"not json")
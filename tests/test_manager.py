@@ -63,9 +63,10 @@ def test_execute_action_prints(monkeypatch):
     mock_module.PrintConfig = MagicMock
     # monkeypatch.setattr("mailops.manager.print_email", mock_print_email) <-- REMOVED
     
-    # Let's try patching sys.modules to be safe regarding the local import
+    # Patch sys.modules for the local import; monkeypatch restores the real
+    # module afterwards so later tests are not left with the mock.
     import sys
-    sys.modules["mailops.actions.print_action"] = mock_module
+    monkeypatch.setitem(sys.modules, "mailops.actions.print_action", mock_module)
 
     mgr = Manager(client=mock_client)
     mgr._config = MagicMock()
@@ -85,7 +86,7 @@ def test_run_daily_automation_matches_rule(monkeypatch):
         message_id="m1", thread_id="t1", from_email="sender@example.com", 
         subject="Newsletter", date=None, snippet="", label_ids=()
     )
-    mock_client.search_messages.return_value = ([item], None)
+    mock_client.iter_messages.return_value = iter([item])
     
     # Mock config with rules
     # Mock config with real rules to pass __init__ logic
@@ -112,17 +113,20 @@ def test_run_daily_automation_matches_rule(monkeypatch):
     
     mgr._rules_engine = MagicMock()
     mgr._rules_engine.first_match.return_value = mock_rule_result
+    mgr._rules_engine.gmail_query.return_value = 'from:"sender@example.com"'
     
     mgr.run_daily_automation()
     
-    # Should have called search
-    mock_client.search_messages.assert_called_once()
+    # Should have scanned every page of the window, prefiltered by sender
+    mock_client.iter_messages.assert_called_once()
+    assert 'from:"sender@example.com"' in mock_client.iter_messages.call_args[0][0]
     
     # Should have checked rules
     mgr._rules_engine.first_match.assert_called_once()
     
-    # Action was archive -> remove INBOX
-    mock_client.modify_labels.assert_called_with("m1", remove=["INBOX"])
+    # Action was archive -> remove INBOX, applied as one batched change
+    mock_client.batch_modify_labels.assert_called_once_with(["m1"], remove=["INBOX"])
+    mock_client.modify_labels.assert_not_called()
 
 def test_preview_rule(monkeypatch):
     mock_client = MagicMock()
@@ -176,3 +180,77 @@ def test_preview_rule(monkeypatch):
     assert len(matches) == 1
     assert matches[0].message_id == "1"
     assert matches[0].subject == "Match Me"
+
+
+def test_execute_automation_plan_batches_clickup(monkeypatch):
+    mock_client = MagicMock()
+    mgr = Manager(client=mock_client, config=MagicMock(print_rules=[]))
+
+    items = [
+        GmailMessageSummary(
+            message_id=f"m{i}", thread_id=None, from_email="a@example.com",
+            subject="Task", date=None, snippet="", label_ids=()
+        )
+        for i in range(2)
+    ]
+    rule = MagicMock()
+    rule.name = "ToClickUp"
+    rule.action = "clickup"
+
+    import mailops.actions.clickup_action as ca
+    mock_batch = MagicMock(return_value=[True, True])
+    monkeypatch.setattr(ca, "create_tasks_from_emails", mock_batch)
+    monkeypatch.setattr(ca, "get_clickup_config", lambda: ca.ClickUpConfig(api_key="k", list_id="l"))
+
+    mgr.execute_automation_plan([(item, rule) for item in items])
+
+    mock_batch.assert_called_once()
+    msgs = mock_batch.call_args[0][0]
+    assert [m.message_id for m in msgs] == ["m0", "m1"]
+    # Plan items already carry the metadata; no per-message refetch.
+    mock_client.get_message_summary.assert_not_called()
+
+
+def test_execute_automation_plan_prints_each_message(monkeypatch):
+    import sys
+    mock_client = MagicMock()
+    mock_client.get_message_full.side_effect = lambda mid: MagicMock(message_id=mid)
+    mgr = Manager(client=mock_client, config=MagicMock(print_rules=[], printer_name="P"))
+
+    mock_module = MagicMock()
+    mock_module.print_email.side_effect = [None, RuntimeError("jammed"), None]
+    monkeypatch.setitem(sys.modules, "mailops.actions.print_action", mock_module)
+
+    rule = MagicMock()
+    rule.name = "ToPrinter"
+    rule.action = "print"
+    items = [
+        GmailMessageSummary(
+            message_id=f"m{i}", thread_id=None, from_email="a@example.com",
+            subject="Print", date=None, snippet="", label_ids=()
+        )
+        for i in range(3)
+    ]
+
+    # One failed job is logged and does not stop the others.
+    mgr.execute_automation_plan([(item, rule) for item in items])
+
+    assert [c.args[0] for c in mock_client.get_message_full.call_args_list] == ["m0", "m1", "m2"]
+    assert mock_module.print_email.call_count == 3
+
+
+def test_get_automation_plan_matches_summaries_without_promoting():
+    from mailops.config import PrintRule, MatchCriteria
+
+    item = GmailMessageSummary(
+        message_id="m1", thread_id=None, from_email="news@example.com",
+        subject="Daily", date=None, snippet="", label_ids=("INBOX",)
+    )
+    mock_client = MagicMock()
+    mock_client.iter_messages.return_value = iter([item])
+    rule = PrintRule(name="News", action="print", match=MatchCriteria(from_domain="example.com"))
+    mgr = Manager(client=mock_client, config=MagicMock(print_rules=[rule]))
+
+    plan = mgr.get_automation_plan()
+
+    assert [(i.message_id, r.name) for i, r in plan] == [("m1", "News")]
@@ -19,17 +19,19 @@ def test_email_to_pdf_writes_pdf(tmp_path: Path):
         attachment_count=0,
     )
     out = tmp_path / "out.pdf"
-    email_to_pdf(msg, out)
+    pdf_bytes = email_to_pdf(msg, out)
     assert out.exists()
     data = out.read_bytes()
     assert data[:4] == b"%PDF"
+    assert data == pdf_bytes
 
 
 def test_print_email_invokes_lp(monkeypatch):
     calls = {}
 
-    def fake_run(cmd, check, stdout, stderr, text):
+    def fake_run(cmd, input, check, stdout, stderr):
         calls["cmd"] = cmd
+        calls["input"] = input
 
         class R:
             stdout = "ok"
@@ -38,6 +40,7 @@ def test_print_email_invokes_lp(monkeypatch):
         return R()
 
     monkeypatch.setattr("mailops.actions.print_action.subprocess.run", fake_run)
+    monkeypatch.setattr("mailops.actions.print_action._cups_connection", lambda: None)
 
     msg = EmailMessage(
         message_id="m2",
@@ -58,6 +61,9 @@ def test_print_email_invokes_lp(monkeypatch):
     assert calls["cmd"][0] == "lp"
     assert "-d" in calls["cmd"]
     assert "HP577dw" in calls["cmd"]
+    # PDF is piped over stdin, no temp file path on the command line
+    assert calls["input"][:4] == b"%PDF"
+    assert not any(arg.endswith(".pdf") for arg in calls["cmd"])
 
 def test_get_available_printers(monkeypatch):
     import subprocess
@@ -74,6 +80,7 @@ def test_get_available_printers(monkeypatch):
     # Patch the actual module object used by get_available_printers
     monkeypatch.setattr(pa.subprocess, "run", mock_run)
 
+    pa.invalidate_printer_cache()
     printers = pa.get_available_printers()
 
     mock_run.assert_called_with(
@@ -85,3 +92,103 @@ def test_get_available_printers(monkeypatch):
     )
     assert printers == ["Canon_Pixel", "HP_OfficeJet"]  # Sorted
 
+
+def test_get_available_printers_is_cached(monkeypatch):
+    import mailops.actions.print_action as pa
+    from unittest.mock import MagicMock
+
+    mock_run = MagicMock()
+    mock_run.return_value.stdout = "HP_OfficeJet accepting requests since Mon\n"
+    monkeypatch.setattr(pa.subprocess, "run", mock_run)
+
+    pa.invalidate_printer_cache()
+    assert pa.get_available_printers() == ["HP_OfficeJet"]
+    assert pa.get_available_printers() == ["HP_OfficeJet"]
+    assert mock_run.call_count == 1
+
+    pa.invalidate_printer_cache()
+    pa.get_available_printers()
+    assert mock_run.call_count == 2
+    pa.invalidate_printer_cache()
+
+
+def test_print_pdf_uses_cups_connection_when_available(monkeypatch):
+    import mailops.actions.print_action as pa
+    from unittest.mock import MagicMock
+
+    conn = MagicMock()
+    conn.createJob.return_value = 7
+    mock_run = MagicMock()
+    monkeypatch.setattr(pa, "_cups_connection", lambda: conn)
+    monkeypatch.setattr(pa.subprocess, "run", mock_run)
+
+    pdf = b"%PDF-1.4"
+    pa.print_pdf("HP577dw", pdf, job_title="Title")
+
+    conn.createJob.assert_called_once_with("HP577dw", "Title", {})
+    conn.startDocument.assert_called_once_with("HP577dw", 7, "Title", "application/pdf", 1)
+    conn.writeRequestData.assert_called_once_with(pdf, len(pdf))
+    conn.finishDocument.assert_called_once_with("HP577dw")
+    mock_run.assert_not_called()
+
+
+def test_print_pdf_jobs_do_not_interleave_on_cups_connection(monkeypatch):
+    import threading
+    import time
+    import mailops.actions.print_action as pa
+
+    events: list[tuple[str, str]] = []
+
+    class Conn:
+        def createJob(self, printer, title, options):
+            events.append(("create", title))
+            time.sleep(0.01)
+            return title
+
+        def startDocument(self, printer, job_id, title, fmt, last):
+            events.append(("start", title))
+
+        def writeRequestData(self, data, length):
+            events.append(("write", data.decode()))
+
+        def finishDocument(self, printer):
+            events.append(("finish", ""))
+
+    conn = Conn()
+    monkeypatch.setattr(pa, "_cups_connection", lambda: conn)
+
+    threads = [
+        threading.Thread(target=pa.print_pdf, args=("P", f"doc{i}".encode(), f"job{i}"))
+        for i in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Each job's four calls are contiguous.
+    for start in range(0, len(events), 4):
+        kinds = [kind for kind, _ in events[start:start + 4]]
+        assert kinds == ["create", "start", "write", "finish"]
+        assert events[start][1][3:] == events[start + 2][1][3:]
+
+
+def test_print_pdf_drops_cups_connection_after_failure(monkeypatch):
+    import pytest
+    import mailops.actions.print_action as pa
+    from unittest.mock import MagicMock
+
+    conn = MagicMock()
+    conn.createJob.side_effect = RuntimeError("server-error-service-unavailable")
+    connections = [conn, None]
+    monkeypatch.setattr(pa, "_cups_connection", lambda: connections[0])
+    monkeypatch.setattr(pa, "_reset_cups_connection", lambda: connections.pop(0))
+    mock_run = MagicMock()
+    monkeypatch.setattr(pa.subprocess, "run", mock_run)
+
+    with pytest.raises(pa.PrintError):
+        pa.print_pdf("HP577dw", b"%PDF-1.4")
+
+    # The next job no longer sees the dead connection and falls back to lp.
+    pa.print_pdf("HP577dw", b"%PDF-1.4")
+    assert mock_run.call_args[0][0][0] == "lp"
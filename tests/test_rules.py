@@ -28,3 +28,111 @@ def test_rules_engine_first_match():
     assert r is not None
     assert r.name == "archive_orders"
     assert r.action == "archive"
+
+
+def _msg(from_email: str, subject: str = "Hello") -> EmailMessage:
+    return EmailMessage(
+        message_id="m", thread_id=None, from_email=from_email, to_emails=(),
+        subject=subject, date=None, snippet="", labels=frozenset(),
+        content=EmailContent(), has_attachments=False, attachment_count=0,
+    )
+
+
+def test_rules_engine_domain_index_keeps_rule_order():
+    from mailops.config import MatchCriteria, PrintRule
+    from mailops.rules import rule_from_config
+
+    engine = RulesEngine(
+        rule_from_config(pr)
+        for pr in (
+            PrintRule("other", "archive", MatchCriteria(from_domain="other.com")),
+            PrintRule("any_hello", "print", MatchCriteria(subject_contains="hello")),
+            PrintRule("example", "delete", MatchCriteria(from_domain="Example.com")),
+        )
+    )
+
+    # Unindexed rule listed earlier still wins over a later domain rule.
+    assert engine.first_match(_msg("a@example.com")).name == "any_hello"
+    assert engine.first_match(_msg("a@example.com", subject="Bye")).name == "example"
+    assert engine.first_match(_msg("a@other.com", subject="Bye")).name == "other"
+    # Domain match is exact, not a substring of the address.
+    assert engine.first_match(_msg("a@example.com.evil", subject="Bye")) is None
+
+
+def test_rules_engine_gmail_query_unions_sender_rules():
+    from mailops.config import MatchCriteria, PrintRule
+    from mailops.rules import rule_from_config
+
+    def engine(*criteria: MatchCriteria) -> RulesEngine:
+        return RulesEngine(rule_from_config(PrintRule(f"r{i}", "print", m)) for i, m in enumerate(criteria))
+
+    assert engine(MatchCriteria(from_domain="example.com")).gmail_query() == 'from:"example.com"'
+    assert engine(
+        MatchCriteria(from_exact="a@x.com", subject_contains="Daily"),
+        MatchCriteria(from_domain="example.com"),
+    ).gmail_query() == '{from:"a@x.com" from:"example.com"}'
+    # A subject-only rule cannot be prefiltered, so no narrowing at all.
+    assert engine(
+        MatchCriteria(from_domain="example.com"),
+        MatchCriteria(subject_contains="invoice"),
+    ).gmail_query() is None
+    assert engine().gmail_query() is None
+
+
+def test_rules_engine_required_fields():
+    from mailops.config import MatchCriteria, PrintRule
+    from mailops.rules import rule_from_config
+
+    engine = RulesEngine([
+        rule_from_config(PrintRule("a", "print", MatchCriteria(from_domain="example.com"))),
+        rule_from_config(PrintRule("b", "print", MatchCriteria(subject_contains="x"))),
+    ])
+    assert engine.required_fields == frozenset({"from_email", "subject"})
+
+    # A hand-written predicate may read anything.
+    opaque = RulesEngine([Rule("c", lambda m: True, "print")])
+    assert opaque.required_fields is None
+
+
+def test_view_predicates_agree_with_message_predicates():
+    from mailops.config import MatchCriteria, PrintRule
+    from mailops.rules import MessageView, rule_from_config
+
+    criteria = [
+        MatchCriteria(from_exact=" Orders@Example.com "),
+        MatchCriteria(from_domain="example.com", subject_excludes="Promo"),
+        MatchCriteria(subject_contains="ORDER"),
+        MatchCriteria(),
+    ]
+    msgs = [
+        _msg("orders@example.com", "Order #1"),
+        _msg("User <a@Example.com>", "Summer promo"),
+        _msg("a@other.com", None),
+        _msg("", "order"),
+    ]
+    for m in criteria:
+        rule = rule_from_config(PrintRule("r", "print", m))
+        for msg in msgs:
+            assert rule.view_predicate(MessageView.of(msg)) == rule.predicate(msg)
+
+
+def test_first_match_batch_matches_each_message():
+    from mailops.config import MatchCriteria, PrintRule
+    from mailops.rules import rule_from_config
+
+    engine = RulesEngine([
+        rule_from_config(PrintRule("orders", "archive", MatchCriteria(subject_contains="order"))),
+    ])
+    results = engine.first_match_batch([_msg("a@x.com", "Your order"), _msg("a@x.com", "Hi")])
+    assert [r.name if r else None for r in results] == ["orders", None]
+
+
+def test_all_of_specializations():
+    t, f = (lambda m: True), (lambda m: False)
+    msg = _msg("a@x.com")
+
+    assert all_of()(msg) is True
+    assert all_of(t) is t
+    assert all_of(t, t)(msg) is True and all_of(t, f)(msg) is False
+    assert all_of(t, t, t)(msg) is True and all_of(t, t, f)(msg) is False
+    assert all_of(t, t, t, t)(msg) is True and all_of(t, t, t, f)(msg) is False
@@ -50,3 +50,9 @@ def test_include_all_mail():
 def test_include_all_mail_and_read():
     q = build_gmail_query(SearchFilters(inbox_only=False, unread_only=False))
     assert q == ""
+
+
+def test_query_is_cached_per_filters_value():
+    f1 = SearchFilters(text="cache", newer_than_days=3)
+    f2 = SearchFilters(text="cache", newer_than_days=3)
+    assert build_gmail_query(f1) is build_gmail_query(f2)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from mailops import web_server
+
+
+def test_dumps_serializes_message_dates(monkeypatch: pytest.MonkeyPatch):
+    # Exercise the stdlib fallback regardless of whether orjson is installed.
+    monkeypatch.setattr(web_server, "orjson", None)
+
+    data = [{"subject": "Café", "date": datetime(2026, 1, 7, 9, 21, tzinfo=timezone.utc)}]
+    out = web_server._dumps(data)
+
+    assert isinstance(out, bytes)
+    assert json.loads(out) == [{"subject": "Café", "date": "2026-01-07T09:21:00+00:00"}]
+
+
+@pytest.fixture
+def server():
+    import threading
+
+    web_server._reset_manager()
+    httpd = web_server.make_server(port=0, host="127.0.0.1")
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        web_server._reset_manager()
+
+
+def _request(url: str, data: bytes | None = None, headers: dict[str, str] | None = None):
+    import urllib.request
+
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    with urllib.request.urlopen(req) as resp:
+        return resp.status, dict(resp.headers), resp.read()
+
+
+def test_preview_streams_matches_as_json_array(server, monkeypatch: pytest.MonkeyPatch):
+    from types import SimpleNamespace
+
+    import mailops.manager
+
+    matches = [
+        SimpleNamespace(message_id=f"m{i}", subject=f"S{i}", from_email="a@example.com", date=None)
+        for i in range(3)
+    ]
+
+    class FakeManager:
+        def preview_rule(self, rule):
+            assert rule.name == "Test"
+            return matches
+
+    monkeypatch.setattr(mailops.manager, "Manager", FakeManager)
+
+    rule = {"name": "Test", "action": "print", "match": {"from_domain": "example.com"}}
+    status, _, body = _request(f"{server}/api/preview", data=json.dumps(rule).encode())
+
+    assert status == 200
+    assert [r["message_id"] for r in json.loads(body)] == ["m0", "m1", "m2"]
+
+
+def test_manager_is_shared_across_requests(server, monkeypatch: pytest.MonkeyPatch):
+    import mailops.manager
+
+    created: list[object] = []
+
+    class FakeManager:
+        def __init__(self):
+            created.append(self)
+
+        def preview_rule(self, rule):
+            return []
+
+    monkeypatch.setattr(mailops.manager, "Manager", FakeManager)
+
+    rule = json.dumps({"name": "T", "action": "print", "match": {}}).encode()
+    for _ in range(2):
+        assert _request(f"{server}/api/preview", data=rule)[2] == b"[]"
+    assert len(created) == 1
+
+
+def test_index_is_gzipped_when_accepted(server):
+    import gzip
+
+    status, headers, body = _request(server + "/", headers={"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == web_server._HTML_BYTES
+
+    _, headers, body = _request(server + "/")
+    assert "Content-Encoding" not in headers
+    assert body == web_server._HTML_BYTES
+
+
+def test_preview_stream_is_gzipped_when_accepted(server, monkeypatch: pytest.MonkeyPatch):
+    import gzip
+    import mailops.manager
+
+    class FakeManager:
+        def preview_rule(self, rule):
+            return [
+                type("M", (), {"message_id": str(i), "subject": "s", "from_email": "a@b.c", "date": None})()
+                for i in range(3)
+            ]
+
+    monkeypatch.setattr(mailops.manager, "Manager", FakeManager)
+
+    rule = json.dumps({"name": "T", "action": "print", "match": {}}).encode()
+    _, headers, body = _request(f"{server}/api/preview", data=rule, headers={"Accept-Encoding": "gzip"})
+
+    assert headers["Content-Encoding"] == "gzip"
+    assert [r["message_id"] for r in json.loads(gzip.decompress(body))] == ["0", "1", "2"]
+
+
+def test_index_is_revalidated_with_etag(server):
+    import urllib.error
+
+    _, headers, _ = _request(server + "/")
+    etag = headers["ETag"]
+    assert etag == web_server._HTML_ETAG
+    assert headers["Cache-Control"] == "public, max-age=60"
+
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _request(server + "/", headers={"If-None-Match": etag})
+    assert exc.value.code == 304
+
+
+def test_printers_are_cached_until_forced(server, monkeypatch: pytest.MonkeyPatch):
+    import sys
+    import types
+
+    calls: list[int] = []
+
+    def fake_printers():
+        calls.append(1)
+        return ["Office"]
+
+    fake_module = types.ModuleType("mailops.actions.print_action")
+    fake_module.get_available_printers = fake_printers
+    invalidations: list[int] = []
+    fake_module.invalidate_printer_cache = lambda: invalidations.append(1)
+    monkeypatch.setitem(sys.modules, "mailops.actions.print_action", fake_module)
+    monkeypatch.setattr(web_server, "_printers_cache", None)
+
+    for _ in range(2):
+        assert json.loads(_request(server + "/api/printers")[2]) == ["Office"]
+    assert len(calls) == 1
+
+    _request(server + "/api/printers?force=1")
+    assert len(calls) == 2
+    assert len(invalidations) == 2
+
+    # Once the TTL lapses, the lpstat cache underneath is cleared too.
+    monkeypatch.setattr(web_server, "_PRINTERS_TTL", 0.0)
+    _request(server + "/api/printers")
+    assert len(calls) == 3
+    assert len(invalidations) == 3